@@ -18,6 +18,7 @@ prompted to provide input interactively.
 Optional:
   --agent-card path/to/card.json  (override default)
   --raw (print each raw JSON envelope line)
+  --http1 (force HTTP/1.1 instead of negotiating HTTP/2)
 
 Run:
 uv run --env-file .env examples/run_orchestrator_call.py --query "Plan a 5 day trip to Paris on a 3000 USD budget"
@@ -25,218 +26,372 @@ uv run --env-file .env examples/run_orchestrator_call.py --query "Plan a 5 day t
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
+import re
+import secrets
+import sys
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from uuid import uuid4
 
 import click
 import httpx
+import orjson
+
+try:  # libuv-backed event loop when available (not on Windows)
+    import uvloop
+
+    _run_async = uvloop.run
+except ImportError:  # pragma: no cover
+    _run_async = asyncio.run
 
-from a2a.client.client import ClientConfig
-from a2a.client.client_factory import ClientFactory
-from a2a.client.errors import A2AClientHTTPError
 from a2a.types import (
     AgentCard,
-    MessageSendParams,
-    SendMessageRequest,
-    SendMessageSuccessResponse,
-    SendStreamingMessageRequest,
-    SendStreamingMessageSuccessResponse,
+    Message,
+    Part,
+    Role,
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
     TaskState,
+    TextPart,
 )
 
 
+# One pooled client per (timeout, http2), shared by every run() in the
+# process. httpx pools are bound to the event loop that first uses them, so
+# close_http_clients() must run on that same loop.
+_HTTP_CLIENTS: dict[tuple[int, bool], httpx.AsyncClient] = {}
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def make_http_client(timeout: int, http2: bool = True) -> httpx.AsyncClient:
+    """Builds the httpx client handed to ClientFactory (HTTP/2 unless http2=False)."""
+    http_timeout = httpx.Timeout(timeout)
+    # http2=True lets the streaming call and follow-up input messages share one
+    # multiplexed connection when the server negotiates h2 (falls back to 1.1).
+    try:
+        return httpx.AsyncClient(
+            timeout=http_timeout, limits=_HTTP_LIMITS, trust_env=False, http2=http2
+        )
+    except ImportError:
+        # httpx raises ImportError when http2=True but the h2 package is missing.
+        log.warning("[WARNING] h2 not installed; falling back to HTTP/1.1.")
+        return httpx.AsyncClient(
+            timeout=http_timeout, limits=_HTTP_LIMITS, trust_env=False
+        )
+
+
+def get_http_client(timeout: int, http2: bool = True) -> httpx.AsyncClient:
+    """Returns the shared client for these settings, creating it on first use."""
+    key = (timeout, http2)
+    client = _HTTP_CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = _HTTP_CLIENTS[key] = make_http_client(timeout, http2)
+    return client
+
+
+async def close_http_clients() -> None:
+    _A2A_CLIENTS.clear()
+    while _HTTP_CLIENTS:
+        _, client = _HTTP_CLIENTS.popitem()
+        await client.aclose()
+
+
+# A2A clients built by ClientFactory, keyed by (card path, card mtime). The
+# httpx client each one wraps is stored alongside so a replaced/closed pool
+# never gets reused.
+_A2A_CLIENTS: dict[tuple[str, int], tuple[httpx.AsyncClient, object]] = {}
+
+
+def get_a2a_client(card_path: Path, httpx_client: httpx.AsyncClient):
+    """Returns (agent_card, client), building the factory client once per card."""
+    mtime_ns = card_path.stat().st_mtime_ns
+    agent_card = _load_card_cached(str(card_path), mtime_ns)
+    key = (str(card_path), mtime_ns)
+    cached = _A2A_CLIENTS.get(key)
+    if cached is not None and cached[0] is httpx_client:
+        return agent_card, cached[1]
+    # The client stack is the heaviest import here; load it on first use so
+    # `--help` stays fast.
+    from a2a.client.client import ClientConfig
+    from a2a.client.client_factory import ClientFactory
+
+    config = ClientConfig(streaming=True, httpx_client=httpx_client)
+    client = ClientFactory(config).create(agent_card)
+    _A2A_CLIENTS[key] = (httpx_client, client)
+    return agent_card, client
+
+
+# Event output is written straight to stdout, one line per record.
+log = logging.getLogger("run_orchestrator_call")
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+log.addHandler(_log_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
+
+
+class RawEnvelopeWriter:
+    """Buffers --raw JSON envelopes and writes them to stdout in batches.
+
+    Serializes through the model's pydantic-core serializer directly and
+    writes bytes, so each envelope costs one buffer append instead of a
+    model_dump_json() + print() round trip.
+    """
+
+    def __init__(self, batch_size: int = 16):
+        self._batch_size = batch_size
+        self._chunks: list[bytes] = []
+
+    def write(self, envelope) -> None:
+        ser = type(envelope).__pydantic_serializer__
+        self._chunks.append(ser.to_json(envelope) + b"\n")
+        if len(self._chunks) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._chunks:
+            return
+        # Keep ordering with any text already logged or printed.
+        sys.stdout.flush()
+        sys.stdout.buffer.write(b"".join(self._chunks))
+        sys.stdout.buffer.flush()
+        self._chunks.clear()
+
+
+# Message ids only need to be unique; one urandom read per id.
+_make_id = secrets.token_hex
+
+# Replies that end the interactive session when input is requested.
+QUIT_VALUES = frozenset({"quit", "exit", "q"})
+
+
+def _no_content(_part) -> None:
+    return None
+
+
+@lru_cache(maxsize=None)
+def _part_resolver(cls: type):
+    """Returns an accessor for the payload attribute of a Part root class."""
+    fields = getattr(cls, "model_fields", {})
+    for attr in ("text", "data"):
+        if attr in fields:
+            return attrgetter(attr)
+    return _no_content
+
+
+def part_content(part):
+    """Returns the text (TextPart) or data (DataPart) payload of a part root."""
+    return _part_resolver(type(part))(part)
+
+
+DEFAULT_QUESTION = "Please provide additional information."
+
+
+def status_content(status):
+    """Returns the payload of the first part of a status message, if any."""
+    if status.message and status.message.parts:
+        return part_content(status.message.parts[0].root)
+    return None
+
+
+# A payload that is a JSON object, optionally wrapped in a ``` code fence.
+# Prose that merely contains braces does not match.
+_JSON_OBJ_RE = re.compile(r"\s*(?:```(?:json)?\s*)?(\{.*\})\s*(?:```\s*)?", re.DOTALL)
+# Payloads above this size are parsed in a worker thread.
+LARGE_PAYLOAD_CHARS = 100_000
+
+
+def _parse_payload(msg_content):
+    """Returns the JSON object embedded in a text payload, else the payload."""
+    if not isinstance(msg_content, str):
+        return msg_content
+    match = _JSON_OBJ_RE.fullmatch(msg_content)
+    if match is None:
+        return msg_content
+    try:
+        return orjson.loads(match.group(1))
+    except orjson.JSONDecodeError:
+        return msg_content
+
+
+def extract_question(msg_content) -> str:
+    """Pulls the question out of an input-required status payload.
+
+    The agent sends either plain text or a JSON object with a "question" key.
+    """
+    if not msg_content:
+        return DEFAULT_QUESTION
+    parsed = _parse_payload(msg_content)
+    if isinstance(parsed, dict):
+        return str(parsed.get("question", msg_content))
+    return str(msg_content)
+
+
+async def question_from_status(msg_content) -> str:
+    """extract_question, offloaded to a thread for very large payloads."""
+    if isinstance(msg_content, str) and len(msg_content) > LARGE_PAYLOAD_CHARS:
+        return await asyncio.to_thread(extract_question, msg_content)
+    return extract_question(msg_content)
+
+
+def build_user_message(text: str) -> Message:
+    """Builds an outgoing user Message without re-running pydantic validation.
+
+    Every field is produced locally from known-good values, so
+    model_construct is safe and skips a full validation pass per send,
+    including the nested Part/TextPart models.
+    """
+    return Message.model_construct(
+        message_id=_make_id(16),
+        role=Role.user,
+        parts=[Part.model_construct(root=TextPart.model_construct(text=text))],
+    )
+
+
+@lru_cache(maxsize=32)
+def _load_card_cached(path_str: str, mtime_ns: int) -> AgentCard:
+    # mtime_ns only participates in the cache key so edits to the card are seen.
+    return AgentCard(**orjson.loads(Path(path_str).read_bytes()))
+
+
 def load_agent_card(path: Path) -> AgentCard:
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return AgentCard(**data)
+    return _load_card_cached(str(path), path.stat().st_mtime_ns)
+
 
+async def run(query: str, card_path: Path, raw: bool, timeout: int, http2: bool = True):  # noqa: C901 (clarity)
+    from a2a.client.errors import A2AClientHTTPError
 
-async def run(query: str, card_path: Path, raw: bool, timeout: int):  # noqa: C901 (clarity)
     if not card_path.exists():
         raise FileNotFoundError(f"Agent card not found: {card_path}")
-    agent_card = load_agent_card(card_path)
-    async with httpx.AsyncClient(timeout=timeout, trust_env=False) as httpx_client:
-        # Configure new factory/client
-        config = ClientConfig(streaming=True, httpx_client=httpx_client)
-        factory = ClientFactory(config)
-        client = factory.create(agent_card)
-
-        # Build message (new API expects a Message object)
-        from a2a.types import Message, Part, TextPart, Role
-
-        message = Message(
-            messageId=str(uuid4()),
-            role=Role.user,
-            parts=[Part(root=TextPart(text=query))],
-        )
+    raw_writer = RawEnvelopeWriter()
+    httpx_client = get_http_client(timeout, http2)
+    agent_card, client = get_a2a_client(card_path, httpx_client)
 
-        print(f"Connecting to {agent_card.url} (auto streaming if supported)...")
-
-        # Helper for task id extraction (reusing previous logic)
-        def _find_task_ids(obj) -> set[str]:  # type: ignore
-            ids: set[str] = set()
-            try:
-                if hasattr(obj, "model_dump"):
-                    obj = obj.model_dump()
-            except Exception:
-                pass
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    kl = k.lower()
-                    if kl in ("taskid", "task_id") and isinstance(v, str):
-                        ids.add(v)
-                    if kl == "task" and isinstance(v, dict):
-                        for cand_key in ("id", "taskId", "task_id"):
-                            cand = v.get(cand_key)
-                            if isinstance(cand, str):
-                                ids.add(cand)
-                    if isinstance(v, (dict, list)):
-                        ids |= _find_task_ids(v)
-            elif isinstance(obj, list):
-                for it in obj:
-                    ids |= _find_task_ids(it)
-            return ids
-
-        async def handle_user_input(task_id: str, question: str) -> bool:
-            """Handle user input when task requires input. Returns True if input was provided."""
-            print(f"\n[INPUT REQUIRED] {question}")
-            print("Please enter your response (or 'quit' to exit):")
-            
-            # Get user input
-            user_input = input("> ").strip()
-            
-            if user_input.lower() in ['quit', 'exit', 'q']:
-                print("[INFO] User chose to exit.")
-                return False
-            
-            if not user_input:
-                print("[WARNING] Empty input provided, skipping...")
-                return False
-            
-            # Send user input as a new message
-            try:
-                input_message = Message(
-                    messageId=str(uuid4()),
-                    role=Role.user,
-                    parts=[Part(root=TextPart(text=user_input))],
-                )
-                
-                print(f"[INFO] Sending user input: {user_input}")
-                
-                # Continue the conversation with the user input
-                async for event in client.send_message(input_message):
-                    if isinstance(event, tuple):
-                        task, update = event
-                        if update and isinstance(update, TaskStatusUpdateEvent):
-                            status = update.status
-                            if status.state == TaskState.input_required:
-                                # Extract question from the status message
-                                question_text = "Please provide additional information."
-                                if status.message and status.message.parts:
-                                    part0 = status.message.parts[0].root
-                                    msg_content = getattr(part0, "text", None) or getattr(part0, "data", None)
-                                    if msg_content:
-                                        try:
-                                            import json
-                                            parsed = json.loads(msg_content) if isinstance(msg_content, str) and msg_content.startswith('{') else {"question": msg_content}
-                                            question_text = parsed.get("question", msg_content)
-                                        except:
-                                            question_text = str(msg_content)
-                                
-                                # Recursively handle more input if needed
-                                return await handle_user_input(task.id, question_text)
-                            else:
-                                # Continue processing other events
-                                msg_txt = None
-                                if status.message and status.message.parts:
-                                    part0 = status.message.parts[0].root
-                                    msg_txt = getattr(part0, "text", None) or getattr(part0, "data", None)
-                                print(f"[status] state={status.state} msg={msg_txt} task_id={task.id}")
-                        elif update and isinstance(update, TaskArtifactUpdateEvent):
-                            art = update.artifact
-                            print(f"[artifact] name={art.name} type={art.parts[0].root.__class__.__name__} task_id={task.id}")
-                    else:
-                        # Final message response
-                        if raw and hasattr(event, 'model_dump_json'):
-                            print(event.model_dump_json())
-                        else:
-                            print("[message]", event)
-                
-                return True
-                
-            except Exception as e:
-                print(f"[ERROR] Failed to send user input: {e}")
-                return False
-
-        first_task_id: str | None = None
-        mismatch_detected = False
+    # Build message (new API expects a Message object)
+    message = build_user_message(query)
+
+    log.info("Connecting to %s (auto streaming if supported)...", agent_card.url)
 
+    async def handle_user_input(task_id: str, question: str) -> bool:
+        """Handle user input when task requires input. Returns True if input was provided."""
+        log.info("\n[INPUT REQUIRED] %s", question)
+        log.info("Please enter your response (or 'quit' to exit):")
+        
+        # Read from a worker thread so the event loop keeps servicing the
+        # connection while the user types.
+        user_input = (await asyncio.to_thread(input, "> ")).strip()
+        
+        if user_input.lower() in QUIT_VALUES:
+            log.info("[INFO] User chose to exit.")
+            return False
+        
+        if not user_input:
+            log.warning("[WARNING] Empty input provided, skipping...")
+            return False
+        
+        # Send user input as a new message
         try:
-            async for event in client.send_message(message):
-                # event is either (Task, UpdateEvent) | Message
+            input_message = build_user_message(user_input)
+            
+            log.info("[INFO] Sending user input: %s", user_input)
+            
+            # Continue the conversation with the user input
+            async for event in client.send_message(input_message):
                 if isinstance(event, tuple):
                     task, update = event
-                    ids = {task.id} if getattr(task, 'id', None) else set()
-                    if first_task_id is None and ids:
-                        first_task_id = next(iter(ids))
-                        print(f"[trace] first_task_id={first_task_id}")
-                    elif first_task_id and any(tid != first_task_id for tid in ids):
-                        mismatch_detected = True
-                        print(f"[trace][WARNING] task_id mismatch: expected={first_task_id} got={ids}")
-
-                    if update is None:
-                        # Initial Task object
-                        print(f"[task] state={task.status.state} id={task.id}")
-                    else:
-                        if isinstance(update, TaskStatusUpdateEvent):
-                            status = update.status
-                            msg_txt = None
-                            if status.message and status.message.parts:
-                                part0 = status.message.parts[0].root
-                                msg_txt = getattr(part0, "text", None) or getattr(part0, "data", None)
-                            
-                            print(f"[status] state={status.state} msg={msg_txt} task_id={task.id}")
-                            
-                            # Handle input required state
-                            if status.state == TaskState.input_required:
-                                question = "Please provide additional information."
-                                if msg_txt:
-                                    try:
-                                        # Try to parse JSON to extract question
-                                        import json
-                                        parsed = json.loads(msg_txt) if isinstance(msg_txt, str) and msg_txt.startswith('{') else {"question": msg_txt}
-                                        question = parsed.get("question", msg_txt)
-                                    except:
-                                        question = str(msg_txt)
-                                
-                                # Handle user input
-                                input_success = await handle_user_input(task.id, question)
-                                if not input_success:
-                                    print("[INFO] Exiting due to user request or input failure.")
-                                    break
-                                    
-                        elif isinstance(update, TaskArtifactUpdateEvent):
-                            art = update.artifact
-                            print(f"[artifact] name={art.name} type={art.parts[0].root.__class__.__name__} task_id={task.id}")
-                        else:
-                            print(f"[event] untyped={update} task_id={task.id}")
+                    if update and isinstance(update, TaskStatusUpdateEvent):
+                        status = update.status
+                        msg_txt = status_content(status)
+                        if status.state == TaskState.input_required:
+                            # Recursively handle more input if needed
+                            return await handle_user_input(task.id, await question_from_status(msg_txt))
+                        # Continue processing other events
+                        log.info("[status] state=%s msg=%s task_id=%s", status.state, msg_txt, task.id)
+                    elif update and isinstance(update, TaskArtifactUpdateEvent):
+                        art = update.artifact
+                        log.info("[artifact] name=%s type=%s task_id=%s", art.name, art.parts[0].root.__class__.__name__, task.id)
                 else:
-                    # A final Message response instead of task stream
-                    if raw and hasattr(event, 'model_dump_json'):
-                        print(event.model_dump_json())
+                    # Final message response
+                    if raw and hasattr(event, '__pydantic_serializer__'):
+                        raw_writer.write(event)
                     else:
-                        print("[message]", event)
-        except A2AClientHTTPError as e:
-            print(f"Client error: {e}")
-        finally:
-            if mismatch_detected:
-                print("[trace] Completed with task id mismatches detected above.")
-            elif first_task_id:
-                print(f"[trace] Completed. All observed task ids matched {first_task_id}.")
+                        log.info("[message] %s", event)
+            
+            raw_writer.flush()
+            return True
+            
+        except Exception as e:
+            log.error("[ERROR] Failed to send user input: %s", e)
+            return False
+
+    # Update handlers for the main stream, dispatched on the concrete event
+    # type. Each returns False when the stream should stop.
+    async def on_status(task, update: TaskStatusUpdateEvent) -> bool:
+        status = update.status
+        msg_txt = status_content(status)
+
+        log.info("[status] state=%s msg=%s task_id=%s", status.state, msg_txt, task.id)
+
+        # Handle input required state
+        if status.state == TaskState.input_required:
+            return await handle_user_input(task.id, await question_from_status(msg_txt))
+        return True
+
+    async def on_artifact(task, update: TaskArtifactUpdateEvent) -> bool:
+        art = update.artifact
+        log.info("[artifact] name=%s type=%s task_id=%s", art.name, art.parts[0].root.__class__.__name__, task.id)
+        return True
+
+    async def on_other(task, update) -> bool:
+        log.info("[event] untyped=%s task_id=%s", update, task.id)
+        return True
+
+    update_handlers = {
+        TaskStatusUpdateEvent: on_status,
+        TaskArtifactUpdateEvent: on_artifact,
+    }
+
+    first_task_id: str | None = None
+    mismatch_detected = False
+
+    try:
+        async for event in client.send_message(message):
+            # event is either (Task, UpdateEvent) | Message
+            if isinstance(event, tuple):
+                task, update = event
+                task_id = task.id
+                if first_task_id is None and task_id:
+                    first_task_id = task_id
+                    log.info("[trace] first_task_id=%s", first_task_id)
+                elif first_task_id and task_id and task_id != first_task_id:
+                    mismatch_detected = True
+                    log.warning("[trace][WARNING] task_id mismatch: expected=%s got=%s", first_task_id, task_id)
+
+                if update is None:
+                    # Initial Task object
+                    log.info("[task] state=%s id=%s", task.status.state, task.id)
+                else:
+                    handler = update_handlers.get(type(update), on_other)
+                    if not await handler(task, update):
+                        log.info("[INFO] Exiting due to user request or input failure.")
+                        break
             else:
-                print("[trace] Completed. No task id observed.")
+                # A final Message response instead of task stream
+                if raw and hasattr(event, '__pydantic_serializer__'):
+                    raw_writer.write(event)
+                else:
+                    log.info("[message] %s", event)
+    except A2AClientHTTPError as e:
+        log.error("Client error: %s", e)
+    finally:
+        raw_writer.flush()
+        if mismatch_detected:
+            log.info("[trace] Completed with task id mismatches detected above.")
+        elif first_task_id:
+            log.info("[trace] Completed. All observed task ids matched %s.", first_task_id)
+        else:
+            log.info("[trace] Completed. No task id observed.")
 
 
 @click.command()
@@ -250,8 +405,15 @@ async def run(query: str, card_path: Path, raw: bool, timeout: int):  # noqa: C9
 )
 @click.option("--timeout", default=120, show_default=True, help="HTTP client timeout seconds")
 @click.option("--raw", is_flag=True, help="Print raw JSON envelopes")
-def cli(query: str, agent_card_path: str, timeout: int, raw: bool):
-    asyncio.run(run(query, Path(agent_card_path), raw, timeout))
+@click.option("--http1", is_flag=True, help="Force HTTP/1.1 instead of negotiating HTTP/2")
+def cli(query: str, agent_card_path: str, timeout: int, raw: bool, http1: bool):
+    async def _main():
+        try:
+            await run(query, Path(agent_card_path), raw, timeout, not http1)
+        finally:
+            await close_http_clients()
+
+    _run_async(_main())
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -22,23 +22,32 @@ from typing import Optional
 
 import click
 
-from a2a_mcp.agents.langgraph_planner_agent import LangGraphPlannerAgent
+try:  # libuv-backed event loop when available (not on Windows)
+    import uvloop
+
+    _run_async = uvloop.run
+except ImportError:  # pragma: no cover
+    _run_async = asyncio.run
 
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s %(message)s')
 logger = logging.getLogger("planner_example")
 
 
 async def run(query: str, session_id: str):
+    # Imported here so `--help` and argument errors don't pay for loading
+    # langchain/langgraph (and the a2a_mcp package) first.
+    from a2a_mcp.agents.langgraph_planner_agent import LangGraphPlannerAgent
+
     agent = LangGraphPlannerAgent()
 
     logger.info("Streaming planner output ...")
     async for chunk in agent.stream(query, session_id, task_id="demo-task"):
-        if chunk.get("response_type") == "text":
-            logger.info(f"[partial] {chunk['content']}")
-        if chunk.get("is_task_complete"):
-            if chunk.get("response_type") == "data":
+        if chunk.response_type == "text":
+            logger.info(f"[partial] {chunk.content}")
+        if chunk.is_task_complete:
+            if chunk.response_type == "data":
                 logger.info("Planner completed. Structured tasks:")
-                logger.info(json.dumps(chunk["content"], indent=2))
+                logger.info(json.dumps(chunk.content, indent=2))
             break
 
 
@@ -46,7 +55,7 @@ async def run(query: str, session_id: str):
 @click.option("--query", required=True, help="User request for planning")
 @click.option("--session-id", default="demo-session", help="Session / thread id")
 def cli(query: str, session_id: str):
-    asyncio.run(run(query, session_id))
+    _run_async(run(query, session_id))
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 import json
 import logging
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import click
@@ -27,6 +28,7 @@ from a2a.server.tasks import (
 from a2a.types import AgentCard
 from a2a_mcp.common import prompts
 from a2a_mcp.common.agent_executor import GenericAgentExecutor
+from a2a_mcp.common.workflow import close_connections
 from a2a_mcp.agents.adk_travel_agent import TravelAgent
 from a2a_mcp.agents.langgraph_planner_agent import LangGraphPlannerAgent
 from a2a_mcp.agents.orchestrator_agent import OrchestratorAgent
@@ -36,6 +38,13 @@ logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s %(na
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app):
+    """Closes the pooled downstream connections when the server stops."""
+    yield
+    await close_connections()
+
+
 def get_agent(agent_card: AgentCard):
     """Get the agent, given an agent card."""
     try:
@@ -96,7 +105,7 @@ def main(host, port, agent_card):
             agent_card=agent_card, http_handler=request_handler
         )
 
-        app = server.build()
+        app = server.build(lifespan=lifespan)
         try:
             # Log available routes to help clients discover correct endpoints (also print to stdout)
             for r in getattr(app, 'routes', []):
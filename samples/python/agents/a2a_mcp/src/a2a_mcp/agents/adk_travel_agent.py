@@ -5,10 +5,10 @@ import logging
 import re
 
 from collections.abc import AsyncIterable
-from typing import Any
 
 from a2a_mcp.common.agent_runner import AgentRunner
 from a2a_mcp.common.base_agent import BaseAgent
+from a2a_mcp.common.types import AgentChunk
 from a2a_mcp.common.utils import get_mcp_server_config, init_api_key
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
@@ -69,7 +69,7 @@ class TravelAgent(BaseAgent):
 
     async def stream(
         self, query, context_id, task_id
-    ) -> AsyncIterable[dict[str, Any]]:
+    ) -> AsyncIterable[AgentChunk]:
         logger.info(
             f'Running {self.agent_name} stream for session {context_id} {task_id} - {query}'
         )
@@ -87,11 +87,11 @@ class TravelAgent(BaseAgent):
                 response = chunk['response']
                 yield self.get_agent_response(response)
             else:
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': f'{self.agent_name}: Processing Request...',
-                }
+                yield AgentChunk(
+                    is_task_complete=False,
+                    require_user_input=False,
+                    content=f'{self.agent_name}: Processing Request...',
+                )
 
     def format_response(self, chunk):
         patterns = [
@@ -117,18 +117,18 @@ class TravelAgent(BaseAgent):
         try:
             if isinstance(data, dict):
                 if 'status' in data and data['status'] == 'input_required':
-                    return {
-                        'response_type': 'text',
-                        'is_task_complete': False,
-                        'require_user_input': True,
-                        'content': data['question'],
-                    }
-                return {
-                    'response_type': 'data',
-                    'is_task_complete': True,
-                    'require_user_input': False,
-                    'content': data,
-                }
+                    return AgentChunk(
+                        response_type='text',
+                        is_task_complete=False,
+                        require_user_input=True,
+                        content=data['question'],
+                    )
+                return AgentChunk(
+                    response_type='data',
+                    is_task_complete=True,
+                    require_user_input=False,
+                    content=data,
+                )
             return_type = 'data'
             try:
                 data = json.loads(data)
@@ -136,17 +136,17 @@ class TravelAgent(BaseAgent):
             except Exception as json_e:
                 logger.error(f'Json conversion error {json_e}')
                 return_type = 'text'
-            return {
-                'response_type': return_type,
-                'is_task_complete': True,
-                'require_user_input': False,
-                'content': data,
-            }
+            return AgentChunk(
+                response_type=return_type,
+                is_task_complete=True,
+                require_user_input=False,
+                content=data,
+            )
         except Exception as e:
             logger.error(f'Error in get_agent_response: {e}')
-            return {
-                'response_type': 'text',
-                'is_task_complete': True,
-                'require_user_input': False,
-                'content': 'Could not complete booking / task. Please try again.',
-            }
+            return AgentChunk(
+                response_type='text',
+                is_task_complete=True,
+                require_user_input=False,
+                content='Could not complete booking / task. Please try again.',
+            )
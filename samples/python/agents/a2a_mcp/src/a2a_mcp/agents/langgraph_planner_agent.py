@@ -1,26 +1,73 @@
 # type: ignore
 
-import json
 import logging
 import os
+import re
 
+from collections import OrderedDict
 from collections.abc import AsyncIterable
-from typing import Any, Literal
+from functools import lru_cache
+from typing import Literal
+
+import orjson
 
 from a2a_mcp.common import prompts
 from a2a_mcp.common.base_agent import BaseAgent
-from a2a_mcp.common.types import TaskList
+from a2a_mcp.common.types import AgentChunk, TaskList
 from a2a_mcp.common.utils import init_api_key
 from langchain_core.messages import AIMessage
-from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel, Field
 
 
-memory = MemorySaver()
 logger = logging.getLogger(__name__)
 
+# A message that is a single JSON object, optionally inside a code fence.
+# Prose that merely mentions braces does not match.
+_JSON_OBJ_RE = re.compile(r'\s*(?:```(?:json)?\s*)?(\{.*\})\s*(?:```\s*)?', re.DOTALL)
+
+# DashScope requires the literal word 'json' to appear in the messages when
+# using a response_format of type json_object. Baking it into the system
+# prompts once means user queries are passed through untouched.
+JSON_RESPONSE_HINT = 'Always respond in valid JSON.'
+
+# Upper bound on conversation threads kept in the planner's checkpointer.
+MAX_CHECKPOINT_THREADS = int(os.getenv('PLANNER_MAX_THREADS', '1024'))
+
+# Completed plans for first-turn queries are reused when A2A_PLANNER_CACHE=1.
+# The model runs at temperature 0, so an identical opening query yields the
+# same plan.
+PLANNER_CACHE_ENABLED = os.getenv('A2A_PLANNER_CACHE') == '1'
+PLANNER_CACHE_SIZE = 512
+
+
+class BoundedMemorySaver(MemorySaver):
+    """In-memory checkpointer that keeps only the most recently used threads.
+
+    MemorySaver keeps every thread's checkpoints for the life of the
+    process. This tracks thread ids in LRU order on every write and drops
+    the least recently used thread once more than `max_threads` exist.
+    """
+
+    def __init__(self, max_threads: int = MAX_CHECKPOINT_THREADS, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._threads: OrderedDict[str, None] = OrderedDict()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config['configurable']['thread_id']
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+        while len(self._threads) > self.max_threads:
+            evicted, _ = self._threads.popitem(last=False)
+            logger.debug('Evicting planner checkpoint thread %s', evicted)
+            super().delete_thread(evicted)
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._threads.pop(thread_id, None)
+        super().delete_thread(thread_id)
+
 
 class ResponseFormat(BaseModel):
     """Respond to the user in this format."""
@@ -41,9 +88,11 @@ class ResponseFormat(BaseModel):
 class LangGraphPlannerAgent(BaseAgent):
     """Planner Agent backed by LangGraph."""
 
-    def __init__(self):
-        init_api_key()
+    _response_cache: OrderedDict[tuple[str, str], ResponseFormat] = (
+        OrderedDict()
+    )
 
+    def __init__(self):
         logger.info('Initializing LanggraphPlannerAgent')
 
         super().__init__(
@@ -52,131 +101,242 @@ class LangGraphPlannerAgent(BaseAgent):
             content_types=['text', 'text/plain'],
         )
 
+        self.model_name = os.getenv('DASHSCOPE_MODEL', 'qwen-plus')
+        self.graph = self._get_graph(
+            self.model_name,
+            'https://dashscope.aliyuncs.com/compatible-mode/v1',
+            f'{prompts.PLANNER_COT_INSTRUCTIONS}\n\n{JSON_RESPONSE_HINT}',
+            # prompts.TRIP_PLANNER_INSTRUCTIONS_1,
+        )
+        self.memory = self.graph.checkpointer
+
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _get_graph(cls, model_name: str, base_url: str, prompt: str):
+        """Builds the react graph once per (model, endpoint, prompt).
+
+        Instances with the same configuration share the compiled graph and
+        its checkpointer, so re-instantiating the planner is cheap.
+        """
+        # langchain_openai and langgraph.prebuilt are slow to import and only
+        # needed once a graph is built.
+        from langchain_openai import ChatOpenAI
+        from langgraph.prebuilt import create_react_agent
+
+        init_api_key()
+
         # Use DashScope OpenAI-compatible endpoint (fallback to base_url env if provided)
-        self.model = ChatOpenAI(
-            model=os.getenv('DASHSCOPE_MODEL', 'qwen-plus'),
+        model = ChatOpenAI(
+            model=model_name,
             temperature=0.0,
-            base_url='https://dashscope.aliyuncs.com/compatible-mode/v1',
+            base_url=base_url,
             api_key=os.getenv('DASHSCOPE_API_KEY'),
         )
 
-        self.graph = create_react_agent(
-            self.model,
-            checkpointer=memory,
-            prompt=prompts.PLANNER_COT_INSTRUCTIONS,
-            # prompt=prompts.TRIP_PLANNER_INSTRUCTIONS_1,
-            response_format=ResponseFormat,
+        return create_react_agent(
+            model,
+            checkpointer=BoundedMemorySaver(),
+            prompt=prompt,
+            # The structured-output call does not see `prompt`, so it gets
+            # the JSON hint as its own system prompt.
+            response_format=(JSON_RESPONSE_HINT, ResponseFormat),
             tools=[],
         )
 
+    def _cache_key(self, query, config) -> tuple[str, str] | None:
+        """Returns the response-cache key, or None when caching is off.
+
+        Only the opening query of a thread is cacheable; later turns depend
+        on the conversation so far.
+        """
+        if not PLANNER_CACHE_ENABLED or self.memory.get_tuple(config):
+            return None
+        return self.model_name, ' '.join(query.split())
+
+    def _cached_response(self, key) -> AgentChunk | None:
+        if key is None:
+            return None
+        structured_response = self._response_cache.get(key)
+        if structured_response is None:
+            return None
+        self._response_cache.move_to_end(key)
+        logger.info('Planner cache hit for %s', key)
+        return self._response_from_structured(structured_response)
+
+    def _store_response(self, key, structured_response) -> None:
+        # Only finished plans are cached. A cached clarifying question
+        # would leave the thread without the history the answer refers to.
+        if (
+            key is None
+            or not isinstance(structured_response, ResponseFormat)
+            or structured_response.status != 'completed'
+            or not structured_response.content
+        ):
+            return
+        self._response_cache[key] = structured_response
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > PLANNER_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
     def invoke(self, query, sessionId) -> str:
         config = {'configurable': {'thread_id': sessionId}}
-        # DashScope requires the literal word 'json' to appear in the messages
-        # when using a response_format of type json_object. Append a short hint
-        # if the user query itself lacks it so we don't force the user to know
-        # this provider-specific requirement.
-        user_query = (
-            query
-            if 'json' in query.lower()
-            else f"{query}\n\nPlease respond in valid JSON."
-        )
-        self.graph.invoke({'messages': [('user', user_query)]}, config)
-        return self.get_agent_response(config)
+        cache_key = self._cache_key(query, config)
+        cached = self._cached_response(cache_key)
+        if cached:
+            return cached
+        self.graph.invoke({'messages': [('user', query)]}, config)
+        values = self.graph.get_state(config).values
+        self._store_response(cache_key, values.get('structured_response'))
+        return self._build_response(values)
 
     async def stream(
         self, query, sessionId, task_id
-    ) -> AsyncIterable[dict[str, Any]]:
-        user_query = (
-            query
-            if 'json' in query.lower()
-            else f"{query}\n\nPlease respond in valid JSON."
-        )
-        inputs = {'messages': [('user', user_query)]}
+    ) -> AsyncIterable[AgentChunk]:
+        inputs = {'messages': [('user', query)]}
         config = {'configurable': {'thread_id': sessionId}}
 
         logger.info(
-            f'Running LanggraphPlannerAgent stream for session {sessionId} {task_id} with input {query}'
+            'Running LanggraphPlannerAgent stream for session %s %s with input %s',
+            sessionId,
+            task_id,
+            query,
         )
 
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
-            message = item['messages'][-1]
-            if isinstance(message, AIMessage):
-                yield {
-                    'response_type': 'text',
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': message.content,
-                }
-        
-        # Always get the final agent response after streaming
-        final_response = self.get_agent_response(config)
-        logger.info(f'Final agent response: {final_response}')
+        cache_key = self._cache_key(query, config)
+        cached = self._cached_response(cache_key)
+        if cached:
+            yield cached
+            return
+
+        # 'messages' emits LLM tokens as they are generated; 'updates' is
+        # only consulted for the structured response at the end of the run.
+        # astream keeps the event loop free while the LLM call is in flight.
+        structured_response = None
+        async for mode, item in self.graph.astream(
+            inputs, config, stream_mode=['messages', 'updates']
+        ):
+            if mode == 'messages':
+                message, metadata = item
+                # Tokens from the structured-output step are the raw JSON
+                # of the final answer, which is yielded once below instead.
+                if (
+                    metadata.get('langgraph_node') == 'agent'
+                    and isinstance(message, AIMessage)
+                    and message.content
+                ):
+                    yield AgentChunk(
+                        response_type='text',
+                        is_task_complete=False,
+                        require_user_input=False,
+                        content=message.content,
+                    )
+                continue
+            for node_update in item.values():
+                # Skips empty updates and non-node entries like '__interrupt__'.
+                if isinstance(node_update, dict) and node_update.get(
+                    'structured_response'
+                ):
+                    structured_response = node_update['structured_response']
+
+        # The structured response normally arrives in the last update; only
+        # read state back from the checkpointer when it is missing.
+        if structured_response:
+            final_response = self._build_response(
+                {'structured_response': structured_response}
+            )
+        else:
+            current_state = await self.graph.aget_state(config)
+            structured_response = current_state.values.get(
+                'structured_response'
+            )
+            final_response = self._build_response(current_state.values)
+        self._store_response(cache_key, structured_response)
+        logger.info('Final agent response: %s', final_response)
         yield final_response
 
     def get_agent_response(self, config):
         current_state = self.graph.get_state(config)
-        logger.info(f'Current state values: {current_state.values}')
-        
-        structured_response = current_state.values.get('structured_response')
-        logger.info(f'Structured response: {structured_response}')
-        
+        return self._build_response(current_state.values)
+
+    def _build_response(self, values):
+        # Fast path: the graph produced a structured response, which is
+        # the normal case. No state logging or JSON parsing needed.
+        structured_response = values.get('structured_response')
+        if isinstance(structured_response, ResponseFormat):
+            response = self._response_from_structured(structured_response)
+            if response:
+                return response
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Current state values: %s', values)
+
         # Try to parse the last message if no structured response
         if not structured_response:
-            messages = current_state.values.get('messages', [])
-            if messages:
-                last_message = messages[-1]
-                logger.info(f'Last message: {last_message}')
-                
-                if isinstance(last_message, AIMessage) and last_message.content:
-                    try:
-                        import json
-                        # Try to parse JSON from the message content
-                        if isinstance(last_message.content, str):
-                            content = last_message.content.strip()
-                            if content.startswith('{') and content.endswith('}'):
-                                parsed_json = json.loads(content)
-                                logger.info(f'Parsed JSON from message: {parsed_json}')
-                                
-                                # Convert to ResponseFormat
-                                if 'status' in parsed_json:
-                                    structured_response = ResponseFormat(**parsed_json)
-                                    logger.info(f'Created structured response from message: {structured_response}')
-                    except Exception as e:
-                        logger.warning(f'Failed to parse JSON from message: {e}')
-        
-        if structured_response and isinstance(structured_response, ResponseFormat):
-            logger.info(f'Processing structured response with status: {structured_response.status}')
-            
-            if structured_response.status == 'input_required':
-                return {
-                    'response_type': 'text',
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.question,
-                }
-            if structured_response.status == 'error':
-                return {
-                    'response_type': 'text',
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.question,
-                }
-            if structured_response.status == 'completed':
-                logger.info(f'Task completed with content: {structured_response.content}')
-                if structured_response.content:
-                    return {
-                        'response_type': 'data',
-                        'is_task_complete': True,
-                        'require_user_input': False,
-                        'content': structured_response.content.model_dump(),
-                    }
-                else:
-                    logger.warning('Completed status but no content provided')
-        
+            structured_response = self._parse_last_message(values)
+            if structured_response:
+                response = self._response_from_structured(structured_response)
+                if response:
+                    return response
+
         logger.warning('No valid structured response found, returning default error response')
-        return {
-            'response_type': 'text',
-            'is_task_complete': False,
-            'require_user_input': True,
-            'content': 'We are unable to process your request at the moment. Please try again.',
-        }
+        return AgentChunk(
+            response_type='text',
+            is_task_complete=False,
+            require_user_input=True,
+            content='We are unable to process your request at the moment. Please try again.',
+        )
+
+    def _parse_last_message(self, values) -> ResponseFormat | None:
+        """Recovers a ResponseFormat from a JSON-only last AI message."""
+        messages = values.get('messages', [])
+        if not messages:
+            return None
+        last_message = messages[-1]
+        logger.info('Last message: %s', last_message)
+
+        if not (isinstance(last_message, AIMessage) and last_message.content):
+            return None
+        try:
+            # Try to parse JSON from the message content; orjson
+            # rejects non-JSON text on the first invalid byte.
+            match = (
+                _JSON_OBJ_RE.fullmatch(last_message.content)
+                if isinstance(last_message.content, str)
+                else None
+            )
+            if match:
+                parsed_json = orjson.loads(match.group(1))
+                logger.info('Parsed JSON from message: %s', parsed_json)
+
+                # Convert to ResponseFormat
+                if isinstance(parsed_json, dict) and 'status' in parsed_json:
+                    structured_response = ResponseFormat(**parsed_json)
+                    logger.info(
+                        'Created structured response from message: %s',
+                        structured_response,
+                    )
+                    return structured_response
+        except orjson.JSONDecodeError:
+            logger.debug('Last message is not JSON')
+        except Exception as e:
+            logger.warning('Failed to parse JSON from message: %s', e)
+        return None
+
+    def _response_from_structured(self, structured_response: ResponseFormat):
+        if structured_response.status in ('input_required', 'error'):
+            return AgentChunk(
+                response_type='text',
+                is_task_complete=False,
+                require_user_input=True,
+                content=structured_response.question,
+            )
+        if structured_response.status == 'completed':
+            if structured_response.content:
+                return AgentChunk(
+                    response_type='data',
+                    is_task_complete=True,
+                    require_user_input=False,
+                    content=structured_response.content.model_dump(),
+                )
+            logger.warning('Completed status but no content provided')
+        return None
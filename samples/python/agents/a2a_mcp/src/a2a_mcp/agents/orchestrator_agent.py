@@ -11,6 +11,7 @@ from a2a.types import (
 )
 from a2a_mcp.common import prompts
 from a2a_mcp.common.base_agent import BaseAgent
+from a2a_mcp.common.types import AgentChunk
 from a2a_mcp.common.utils import init_api_key
 from a2a_mcp.common.workflow import Status, WorkflowGraph, WorkflowNode
 from openai import OpenAI
@@ -167,7 +168,7 @@ class OrchestratorAgent(BaseAgent):
 
     async def stream(
         self, query, context_id, task_id
-    ) -> AsyncIterable[dict[str, any]]:
+    ) -> AsyncIterable[AgentChunk]:
         """Execute and stream response."""
         logger.info(
             f'Running {self.agent_name} stream for session {context_id}, task {task_id} - {query}'
@@ -227,78 +228,76 @@ class OrchestratorAgent(BaseAgent):
                 chunk_count += 1
                 logger.info(f'Received chunk #{chunk_count}: {type(chunk)} - {str(chunk)[:200]}...')
                 
-                # Handle the response format expected by agent executor
-                if isinstance(chunk, dict):
-                    # Check if the task needs input
-                    if chunk.get('require_user_input', False):
-                        question = chunk.get('content', 'Need more information')
-                        logger.info(f'Task requires user input: {question}')
+                # Check if the task needs input
+                if chunk.require_user_input:
+                    question = chunk.content or 'Need more information'
+                    logger.info(f'Task requires user input: {question}')
 
-                        try:
-                            logger.info('Attempting to answer user question with orchestrator')
-                            answer = json.loads(
-                                self.answer_user_question(question)
-                            )
-                            logger.info(f'Agent Answer: {answer}')
-                            if answer['can_answer'] == 'yes':
-                                # Orchestrator can answer on behalf of the user set the query
-                                # Resume workflow from paused state.
-                                query = answer['answer']
-                                start_node_id = self.graph.paused_node_id
-                                logger.info(f'Resuming workflow with answer: {query} from node: {start_node_id}')
-                                self.set_node_attributes(
-                                    node_id=start_node_id, query=query
-                                )
-                                should_resume_workflow = True
-                            else:
-                                logger.info('Orchestrator cannot answer the question')
-                        except Exception as e:
-                            logger.error(f'Cannot convert answer data: {e}')
-                            import traceback
-                            logger.error(f'Traceback: {traceback.format_exc()}')
-                    
-                    # Check for task completion with artifact
-                    elif chunk.get('is_task_complete', False) and 'artifact' in chunk:
-                        artifact = chunk['artifact']
-                        logger.info(f'Task completed with artifact: {artifact.name}')
-                        self.results.append(artifact)
-                        if artifact.name == 'PlannerAgent-result':
-                            # Planning agent returned data, update graph.
-                            artifact_data = artifact.parts[0].root.data
-                            logger.info(f'Planner artifact data: {artifact_data}')
-                            if 'trip_info' in artifact_data:
-                                self.travel_context = artifact_data['trip_info']
-                                logger.info(f'Updated travel context: {self.travel_context}')
-                            logger.info(
-                                f'Updating workflow with {len(artifact_data["tasks"])} task nodes'
+                    try:
+                        logger.info('Attempting to answer user question with orchestrator')
+                        answer = json.loads(
+                            self.answer_user_question(question)
+                        )
+                        logger.info(f'Agent Answer: {answer}')
+                        if answer['can_answer'] == 'yes':
+                            # Orchestrator can answer on behalf of the user set the query
+                            # Resume workflow from paused state.
+                            query = answer['answer']
+                            start_node_id = self.graph.paused_node_id
+                            logger.info(f'Resuming workflow with answer: {query} from node: {start_node_id}')
+                            self.set_node_attributes(
+                                node_id=start_node_id, query=query
                             )
-                            # Define the edges
-                            current_node_id = start_node_id
-                            for idx, task_data in enumerate(
-                                artifact_data['tasks']
-                            ):
-                                logger.info(f'Adding task node {idx}: {task_data["description"]}')
-                                node = self.add_graph_node(
-                                    task_id=task_id,
-                                    context_id=context_id,
-                                    query=task_data['description'],
-                                    node_id=current_node_id,
-                                )
-                                current_node_id = node.id
-                                # Restart graph from the newly inserted subgraph state
-                                # Start from the new node just created.
-                                if idx == 0:
-                                    should_resume_workflow = True
-                                    start_node_id = node.id
-                                    logger.info(f'Will resume workflow from new node: {start_node_id}')
+                            should_resume_workflow = True
                         else:
-                            # Not planner but artifacts from other tasks,
-                            # continue to the next node in the workflow.
-                            # client does not get the artifact,
-                            # a summary is shown at the end of the workflow.
-                            logger.info(f'Non-planner artifact completed: {artifact.name}')
-                            continue
+                            logger.info('Orchestrator cannot answer the question')
+                    except Exception as e:
+                        logger.error(f'Cannot convert answer data: {e}')
+                        import traceback
+                        logger.error(f'Traceback: {traceback.format_exc()}')
                 
+                # Check for task completion with artifact
+                elif chunk.is_task_complete and chunk.artifact is not None:
+                    artifact = chunk.artifact
+                    logger.info(f'Task completed with artifact: {artifact.name}')
+                    self.results.append(artifact)
+                    if artifact.name == 'PlannerAgent-result':
+                        # Planning agent returned data, update graph.
+                        artifact_data = artifact.parts[0].root.data
+                        logger.info(f'Planner artifact data: {artifact_data}')
+                        if 'trip_info' in artifact_data:
+                            self.travel_context = artifact_data['trip_info']
+                            logger.info(f'Updated travel context: {self.travel_context}')
+                        logger.info(
+                            f'Updating workflow with {len(artifact_data["tasks"])} task nodes'
+                        )
+                        # Define the edges
+                        current_node_id = start_node_id
+                        for idx, task_data in enumerate(
+                            artifact_data['tasks']
+                        ):
+                            logger.info(f'Adding task node {idx}: {task_data["description"]}')
+                            node = self.add_graph_node(
+                                task_id=task_id,
+                                context_id=context_id,
+                                query=task_data['description'],
+                                node_id=current_node_id,
+                            )
+                            current_node_id = node.id
+                            # Restart graph from the newly inserted subgraph state
+                            # Start from the new node just created.
+                            if idx == 0:
+                                should_resume_workflow = True
+                                start_node_id = node.id
+                                logger.info(f'Will resume workflow from new node: {start_node_id}')
+                    else:
+                        # Not planner but artifacts from other tasks,
+                        # continue to the next node in the workflow.
+                        # client does not get the artifact,
+                        # a summary is shown at the end of the workflow.
+                        logger.info(f'Non-planner artifact completed: {artifact.name}')
+                        continue
+            
                 # When the workflow needs to be resumed, do not yield partial.
                 if not should_resume_workflow:
                     logger.info('No workflow resume detected, yielding chunk')
@@ -326,9 +325,9 @@ class OrchestratorAgent(BaseAgent):
             logger.info(f'Generated summary: {summary}')
             self.clear_state()
             logger.info('State cleared after completion')
-            yield {
-                'response_type': 'text',
-                'is_task_complete': True,
-                'require_user_input': False,
-                'content': summary,
-            }
+            yield AgentChunk(
+                response_type='text',
+                is_task_complete=True,
+                require_user_input=False,
+                content=summary,
+            )
@@ -62,14 +62,14 @@ class GenericAgentExecutor(AgentExecutor):
                     await event_queue.enqueue_event(event)
                 continue
 
-            is_task_complete = item['is_task_complete']
-            require_user_input = item['require_user_input']
+            is_task_complete = item.is_task_complete
+            require_user_input = item.require_user_input
 
             if is_task_complete:
-                if item['response_type'] == 'data':
-                    part = DataPart(data=item['content'])
+                if item.response_type == 'data':
+                    part = DataPart(data=item.content)
                 else:
-                    part = TextPart(text=item['content'])
+                    part = TextPart(text=item.content)
 
                 await updater.add_artifact(
                     [part],
@@ -81,7 +81,7 @@ class GenericAgentExecutor(AgentExecutor):
                 await updater.update_status(
                     TaskState.input_required,
                     new_agent_text_message(
-                        item['content'],
+                        item.content,
                         task.context_id,
                         task.id,
                     ),
@@ -91,7 +91,7 @@ class GenericAgentExecutor(AgentExecutor):
             await updater.update_status(
                 TaskState.working,
                 new_agent_text_message(
-                    item['content'],
+                    item.content,
                     task.context_id,
                     task.id,
                 ),
@@ -1,10 +1,23 @@
 # type: ignore
 
+from dataclasses import dataclass
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field, model_validator
 
 
+@dataclass(slots=True)
+class AgentChunk:
+    """A single item streamed from an agent to its executor."""
+
+    response_type: str = 'text'
+    is_task_complete: bool = False
+    require_user_input: bool = False
+    content: Any = None
+    task_id: str | None = None
+    artifact: Any = None
+
+
 class ServerConfig(BaseModel):
     """Server Confgiguration."""
 
@@ -1,19 +1,20 @@
-import json
+import asyncio
+import itertools
 import logging
-import uuid
+import os
+import secrets
 
-from collections.abc import AsyncIterable
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterable, Awaitable, Callable
+from contextlib import asynccontextmanager
 from enum import Enum
-from uuid import uuid4
+from typing import TYPE_CHECKING, Any
 
-import httpx
-import networkx as nx
+import orjson
 
-from a2a.client.client import ClientConfig
-from a2a.client.client_factory import ClientFactory
-from a2a.client.errors import A2AClientHTTPError
 from a2a.types import (
     AgentCard,
+    DataPart,
     Message,
     Part,
     TextPart,
@@ -22,12 +23,129 @@ from a2a.types import (
     TaskState,
     TaskStatusUpdateEvent,
 )
+from a2a_mcp.common.types import AgentChunk
 from a2a_mcp.common.utils import get_mcp_server_config
 from a2a_mcp.mcp import client
 
 
+if TYPE_CHECKING:
+    import httpx
+
+
 logger = logging.getLogger(__name__)
 
+# Node ids are only used as keys inside this process's graphs, so a
+# counter is enough; message ids go to other agents and stay random.
+_node_ids = itertools.count()
+_node_id_prefix = f'{os.getpid()}-'
+
+_shared_httpx: 'httpx.AsyncClient | None' = None
+_shared_httpx_lock = asyncio.Lock()
+
+
+async def get_httpx_client() -> 'httpx.AsyncClient':
+    """Returns the process-wide HTTP client used for downstream agent calls.
+
+    The client is created on first use and keeps its connections alive, so
+    consecutive nodes talking to the same agent skip the TCP handshake.
+    """
+    import httpx
+
+    global _shared_httpx
+    async with _shared_httpx_lock:
+        if _shared_httpx is None or _shared_httpx.is_closed:
+            # Use trust_env=False so local intra-process calls (localhost) are NOT routed via any
+            # corporate/system HTTP proxies (e.g., Privoxy) which were injecting HTML error pages
+            # and breaking SSE (Content-Type became text/html).
+            _shared_httpx = httpx.AsyncClient(
+                trust_env=False,
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=64, max_connections=128
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+        return _shared_httpx
+
+
+async def close_httpx_client() -> None:
+    """Closes the shared HTTP client, if one was created."""
+    global _shared_httpx
+    async with _shared_httpx_lock:
+        if _shared_httpx is not None:
+            await _shared_httpx.aclose()
+            _shared_httpx = None
+
+
+AGENT_CARD_CACHE_SIZE = 256
+_agent_card_cache: OrderedDict[str, AgentCard] = OrderedDict()
+_agent_card_locks: dict[str, asyncio.Lock] = {}
+
+
+async def close_connections() -> None:
+    """Closes the shared HTTP client and the pooled MCP sessions.
+
+    Called when the agent server shuts down, so the MCP holder tasks (and,
+    with stdio, the MCP server subprocess) are stopped deliberately.
+    """
+    await close_httpx_client()
+    await client.close_sessions()
+
+
+@asynccontextmanager
+async def mcp_session():
+    """Yields the process-wide MCP session, connecting on first use.
+
+    A failure while the session is in use drops it, so the next caller
+    reconnects instead of reusing a broken stream.
+    """
+    config = get_mcp_server_config()
+    async with client.pooled_session(
+        config.host, config.port, config.transport
+    ) as session:
+        yield session
+
+
+async def _cached_agent_card(
+    key: str, fetch: Callable[[], Awaitable[AgentCard | None]]
+) -> AgentCard | None:
+    """Returns the agent card for key, calling fetch only on a cache miss."""
+    card = _agent_card_cache.get(key)
+    if card is None:
+        lock = _agent_card_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                card = _agent_card_cache.get(key)
+                if card is None:
+                    card = await fetch()
+                    if card is None:
+                        return None
+                    _agent_card_cache[key] = card
+                    if len(_agent_card_cache) > AGENT_CARD_CACHE_SIZE:
+                        _agent_card_cache.popitem(last=False)
+        finally:
+            # The lock only guards the fill; dropping it once the fill is
+            # done keeps the lock table from growing with every key seen.
+            if _agent_card_locks.get(key) is lock:
+                del _agent_card_locks[key]
+    _agent_card_cache.move_to_end(key)
+    return card
+
+
+def _part_payload(parts, default: str) -> tuple[str, Any]:
+    """Returns (response_type, content) for the first of a list of parts.
+
+    Falls back to ('text', default) when there are no parts or the first
+    one carries neither text nor data.
+    """
+    if parts:
+        root = parts[0].root
+        if isinstance(root, DataPart):
+            return 'data', root.data
+        if isinstance(root, TextPart) and root.text:
+            return 'text', root.text
+    return 'text', default
+
 
 class Status(Enum):
     """Represents the status of a workflow and its associated node."""
@@ -54,7 +172,7 @@ class WorkflowNode:
         node_key: str | None = None,
         node_label: str | None = None,
     ):
-        self.id = str(uuid.uuid4())
+        self.id = f'{_node_id_prefix}{next(_node_ids)}'
         self.node_key = node_key
         self.node_label = node_label
         self.task = task
@@ -63,34 +181,45 @@ class WorkflowNode:
 
     async def get_planner_resource(self) -> AgentCard | None:
         logger.info(f'Getting resource for node {self.id}')
-        config = get_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
+        return await _cached_agent_card('planner', self._fetch_planner_card)
+
+    async def _fetch_planner_card(self) -> AgentCard | None:
+        async with mcp_session() as session:
             response = await client.find_resource(
                 session, 'resource://agent_cards/planner_agent'
             )
-            data = json.loads(response.contents[0].text)
-            return AgentCard(**data['agent_card'][0])
+            data = orjson.loads(response.contents[0].text)
+            # Validation stays: model_construct would leave nested models
+            # such as capabilities and skills as raw dicts, which the client
+            # factory reads as attributes. It only runs on a cache miss.
+            return AgentCard.model_validate(data['agent_card'][0])
 
     async def find_agent_for_task(self) -> AgentCard | None:
         logger.info(f'Find agent for task - {self.task}')
-        config = get_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
+        key = ' '.join(self.task.lower().split())
+        return await _cached_agent_card(key, self._fetch_task_card)
+
+    async def _fetch_task_card(self) -> AgentCard | None:
+        async with mcp_session() as session:
             result = await client.find_agent(session, self.task)
-            agent_card_json = json.loads(result.content[0].text)
-            logger.debug(f'Found agent {agent_card_json} for task {self.task}')
-            return AgentCard(**agent_card_json)
+            # Parse and validate in a single pass instead of building an
+            # intermediate dict first.
+            agent_card = AgentCard.model_validate_json(result.content[0].text)
+            logger.debug('Found agent %s for task %s', agent_card.name, self.task)
+            return agent_card
 
     async def run_node(
         self,
         query: str,
         task_id: str,
         context_id: str,
-    ) -> AsyncIterable[dict[str, any]]:
-        logger.info(f'Executing node {self.id}')
+    ) -> AsyncIterable[AgentChunk]:
+        # The A2A client stack is only needed once a node actually runs.
+        from a2a.client.client import ClientConfig
+        from a2a.client.client_factory import ClientFactory
+        from a2a.client.errors import A2AClientHTTPError
+
+        logger.info('Executing node %s', self.id)
         agent_card = None
         if self.node_key == 'planner':
             agent_card = await self.get_planner_resource()
@@ -99,181 +228,232 @@ class WorkflowNode:
         if not agent_card:
             logger.error('No agent card resolved for node; aborting execution')
             return
-        logger.info(
-            'Invoking downstream agent name=%s url=%s node_key=%s task_snippet=%s',
-            getattr(agent_card, 'name', 'UNKNOWN'),
-            getattr(agent_card, 'url', 'UNKNOWN'),
-            self.node_key,
-            (query[:80] + '…') if query and len(query) > 80 else query,
-        )
-        # Use trust_env=False so local intra-process calls (localhost) are NOT routed via any
-        # corporate/system HTTP proxies (e.g., Privoxy) which were injecting HTML error pages
-        # and breaking SSE (Content-Type became text/html).
-        async with httpx.AsyncClient(trust_env=False) as httpx_client:
-            # Use new A2A client API
-            config = ClientConfig(streaming=True, httpx_client=httpx_client)
-            factory = ClientFactory(config)
-            a2a_client = factory.create(agent_card)
-
-            # Build message using new API
-            message = Message(
-                messageId=str(uuid4()),
-                role=Role.user,
-                parts=[Part(root=TextPart(text=query))],
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Invoking downstream agent name=%s url=%s node_key=%s task_snippet=%s',
+                getattr(agent_card, 'name', 'UNKNOWN'),
+                getattr(agent_card, 'url', 'UNKNOWN'),
+                self.node_key,
+                (query[:80] + '…') if query and len(query) > 80 else query,
             )
+        httpx_client = await get_httpx_client()
+        # Use new A2A client API
+        config = ClientConfig(streaming=True, httpx_client=httpx_client)
+        factory = ClientFactory(config)
+        a2a_client = factory.create(agent_card)
+
+        # Every field is produced here from known-good values, so the
+        # message and its parts are built without pydantic validation.
+        message = Message.model_construct(
+            message_id=secrets.token_hex(16),
+            role=Role.user,
+            parts=[Part.model_construct(root=TextPart.model_construct(text=query))],
+        )
 
-            try:
-                async for event in a2a_client.send_message(message):
-                    # event is either (Task, UpdateEvent) | Message
-                    if isinstance(event, tuple):
-                        task, update = event
-                        if update is None:
-                            # Initial Task object - don't yield, just log
-                            logger.info(f'Task {task.id} status: {task.status.state}')
-                        else:
-                            if isinstance(update, TaskStatusUpdateEvent):
-                                # Check for input_required state
-                                if update.status.state == TaskState.input_required:
-                                    msg_txt = "Need more information"
-                                    if update.status.message and update.status.message.parts:
-                                        part0 = update.status.message.parts[0].root
-                                        msg_txt = getattr(part0, "text", None) or getattr(part0, "data", None) or msg_txt
-                                    
-                                    yield {
-                                        'response_type': 'text',
-                                        'is_task_complete': False,
-                                        'require_user_input': True,
-                                        'content': msg_txt,
-                                        'task_id': task.id,
-                                    }
-                                else:
-                                    # Working state or other status
-                                    msg_txt = "Processing..."
-                                    if update.status.message and update.status.message.parts:
-                                        part0 = update.status.message.parts[0].root
-                                        msg_txt = getattr(part0, "text", None) or getattr(part0, "data", None) or msg_txt
-                                    
-                                    yield {
-                                        'response_type': 'text',
-                                        'is_task_complete': False,
-                                        'require_user_input': False,
-                                        'content': msg_txt,
-                                        'task_id': task.id,
-                                    }
-                            elif isinstance(update, TaskArtifactUpdateEvent):
-                                # Save artifact and yield completion
-                                artifact = update.artifact
-                                self.results = artifact
-                                
-                                # Extract content from artifact
-                                content = "Task completed"
-                                if artifact.parts:
-                                    part0 = artifact.parts[0].root
-                                    if hasattr(part0, 'data'):
-                                        content = part0.data
-                                    elif hasattr(part0, 'text'):
-                                        content = part0.text
-                                
-                                yield {
-                                    'response_type': 'data' if hasattr(artifact.parts[0].root, 'data') else 'text',
-                                    'is_task_complete': True,
-                                    'require_user_input': False,
-                                    'content': content,
-                                    'task_id': task.id,
-                                    'artifact': artifact,  # Keep artifact for orchestrator
-                                }
-                            else:
-                                # Other update types - yield as working
-                                yield {
-                                    'response_type': 'text',
-                                    'is_task_complete': False,
-                                    'require_user_input': False,
-                                    'content': f"Update: {update}",
-                                    'task_id': task.id,
-                                }
-                    else:
-                        # Final Message response - treat as completion
-                        content = "Task completed"
-                        if hasattr(event, 'parts') and event.parts:
-                            part0 = event.parts[0].root
-                            content = getattr(part0, "text", None) or getattr(part0, "data", None) or content
-                        
-                        yield {
-                            'response_type': 'text',
-                            'is_task_complete': True,
-                            'require_user_input': False,
-                            'content': content,
-                        }
-            except A2AClientHTTPError as e:
-                logger.error('A2A client error: %s', e)
-                raise
+        events = a2a_client.send_message(message)
+        try:
+            async for event in events:
+                chunk = self._event_chunk(event)
+                if chunk is None:
+                    continue
+                yield chunk
+                if chunk.require_user_input:
+                    # Resuming sends a new message, so nothing further on
+                    # this stream is needed; release the connection now.
+                    return
+        except A2AClientHTTPError as e:
+            logger.error('A2A client error: %s', e)
+            raise
+        finally:
+            await events.aclose()
+
+    def _event_chunk(self, event) -> AgentChunk | None:
+        """Converts one event from the downstream A2A client into a chunk.
+
+        Returns None for events that are only logged.
+        """
+        # event is either (Task, UpdateEvent) | Message
+        if not isinstance(event, tuple):
+            # Final Message response - treat as completion
+            _, content = _part_payload(event.parts, 'Task completed')
+            return AgentChunk(
+                response_type='text',
+                is_task_complete=True,
+                require_user_input=False,
+                content=content,
+            )
+        task, update = event
+        if update is None:
+            # Initial Task object - don't yield, just log
+            logger.info('Task %s status: %s', task.id, task.status.state)
+            return None
+        if isinstance(update, TaskStatusUpdateEvent):
+            status_message = update.status.message
+            status_parts = status_message.parts if status_message else None
+            # Check for input_required state
+            if update.status.state == TaskState.input_required:
+                _, msg_txt = _part_payload(status_parts, 'Need more information')
+                return AgentChunk(
+                    response_type='text',
+                    is_task_complete=False,
+                    require_user_input=True,
+                    content=msg_txt,
+                    task_id=task.id,
+                )
+            # Working state or other status
+            _, msg_txt = _part_payload(status_parts, 'Processing...')
+            return AgentChunk(
+                response_type='text',
+                is_task_complete=False,
+                require_user_input=False,
+                content=msg_txt,
+                task_id=task.id,
+            )
+        if isinstance(update, TaskArtifactUpdateEvent):
+            # Save artifact and yield completion
+            artifact = update.artifact
+            self.results = artifact
+            # Extract content from artifact
+            response_type, content = _part_payload(
+                artifact.parts, 'Task completed'
+            )
+            return AgentChunk(
+                response_type=response_type,
+                is_task_complete=True,
+                require_user_input=False,
+                content=content,
+                task_id=task.id,
+                artifact=artifact,  # Keep artifact for orchestrator
+            )
+        # Other update types - yield as working
+        return AgentChunk(
+            response_type='text',
+            is_task_complete=False,
+            require_user_input=False,
+            content=f'Update: {update}',
+            task_id=task.id,
+        )
 
 
 class WorkflowGraph:
     """Represents a graph of workflow nodes."""
 
     def __init__(self) -> None:
-        self.graph = nx.DiGraph()
+        # Plain adjacency: successors, predecessor counts and node attributes.
+        self._succ: dict[str, list[str]] = {}
+        self._pred_count: dict[str, int] = {}
+        self._attrs: dict[str, dict] = {}
         self.nodes = {}
         self.latest_node = None
         self.node_type = None
         self.state = Status.INITIALIZED
         self.paused_node_id = None
+        # Topology derived from the graph, rebuilt only after it changes.
+        self._topo_cache: list[str] | None = None
+        self._roots_cache: list[str] | None = None
+        self._descendants_cache: dict[str, set[str]] = {}
 
     def add_node(self, node) -> None:
         logger.info(f'Adding node {node.id}')
-        self.graph.add_node(node.id, query=node.task)
+        self._succ.setdefault(node.id, [])
+        self._pred_count.setdefault(node.id, 0)
+        self._attrs.setdefault(node.id, {})['query'] = node.task
         self.nodes[node.id] = node
         self.latest_node = node.id
+        self._invalidate_topology()
 
     def add_edge(self, from_node_id: str, to_node_id: str) -> None:
         if from_node_id not in self.nodes or to_node_id not in self.nodes:
             raise ValueError('Invalid node IDs')
 
-        self.graph.add_edge(from_node_id, to_node_id)
+        successors = self._succ[from_node_id]
+        if to_node_id not in successors:
+            successors.append(to_node_id)
+            self._pred_count[to_node_id] += 1
+        self._invalidate_topology()
+
+    def _invalidate_topology(self) -> None:
+        self._topo_cache = None
+        self._roots_cache = None
+        self._descendants_cache.clear()
+
+    def _topological_order(self) -> list[str]:
+        """Kahn's algorithm over the adjacency dicts."""
+        pred_count = dict(self._pred_count)
+        ready = deque(n for n, d in pred_count.items() if d == 0)
+        order = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for succ in self._succ[node_id]:
+                pred_count[succ] -= 1
+                if pred_count[succ] == 0:
+                    ready.append(succ)
+        if len(order) != len(pred_count):
+            raise ValueError('Workflow graph contains a cycle')
+        return order
+
+    def _descendants(self, node_id: str) -> set[str]:
+        seen = set()
+        pending = deque(self._succ[node_id])
+        while pending:
+            current = pending.popleft()
+            if current not in seen:
+                seen.add(current)
+                pending.extend(self._succ[current])
+        return seen
+
+    def _sub_graph(self, start_nodes: list[str]) -> list[str]:
+        """Nodes reachable from start_nodes, in topological order."""
+        if self._topo_cache is None:
+            self._topo_cache = self._topological_order()
+        applicable_graph = set(start_nodes)
+        for node_id in start_nodes:
+            descendants = self._descendants_cache.get(node_id)
+            if descendants is None:
+                descendants = self._descendants(node_id)
+                self._descendants_cache[node_id] = descendants
+            applicable_graph.update(descendants)
+        return [n for n in self._topo_cache if n in applicable_graph]
 
     async def run_workflow(
         self, start_node_id: str | None = None
-    ) -> AsyncIterable[dict[str, any]]:
+    ) -> AsyncIterable[AgentChunk]:
         logger.info('Executing workflow graph')
         if not start_node_id or start_node_id not in self.nodes:
-            start_nodes = [n for n, d in self.graph.in_degree() if d == 0]
+            if self._roots_cache is None:
+                self._roots_cache = [
+                    n for n, d in self._pred_count.items() if d == 0
+                ]
+            start_nodes = self._roots_cache
         else:
             start_nodes = [self.nodes[start_node_id].id]
 
-        applicable_graph = set()
-
-        for node_id in start_nodes:
-            applicable_graph.add(node_id)
-            applicable_graph.update(nx.descendants(self.graph, node_id))
-
-        complete_graph = list(nx.topological_sort(self.graph))
-        sub_graph = [n for n in complete_graph if n in applicable_graph]
+        sub_graph = self._sub_graph(start_nodes)
         logger.info(f'Sub graph {sub_graph} size {len(sub_graph)}')
         self.state = Status.RUNNING
         # Alternative is to loop over all nodes, but we only need the connected nodes.
         for node_id in sub_graph:
             node = self.nodes[node_id]
             node.state = Status.RUNNING
-            query = self.graph.nodes[node_id].get('query')
-            task_id = self.graph.nodes[node_id].get('task_id')
-            context_id = self.graph.nodes[node_id].get('context_id')
+            attrs = self._attrs[node_id]
+            query = attrs.get('query')
+            task_id = attrs.get('task_id')
+            context_id = attrs.get('context_id')
             async for chunk in node.run_node(query, task_id, context_id):
                 # When the workflow node is paused, do not yield any chunks
                 # but, let the loop complete.
                 if node.state != Status.PAUSED:
-                    # Handle the response format
-                    if isinstance(chunk, dict):
-                        # Check for input required state
-                        if chunk.get('require_user_input', False):
-                            node.state = Status.PAUSED
-                            self.state = Status.PAUSED
-                            self.paused_node_id = node.id
-                        # Check for task completion
-                        elif chunk.get('is_task_complete', False):
-                            # Store any artifact if present
-                            if 'artifact' in chunk:
-                                node.results = chunk['artifact']
+                    # Check for input required state
+                    if chunk.require_user_input:
+                        node.state = Status.PAUSED
+                        self.state = Status.PAUSED
+                        self.paused_node_id = node.id
+                    # Check for task completion
+                    elif chunk.is_task_complete:
+                        # Store any artifact if present
+                        if chunk.artifact is not None:
+                            node.results = chunk.artifact
                     yield chunk
             if self.state == Status.PAUSED:
                 break
@@ -283,10 +463,12 @@ class WorkflowGraph:
             self.state = Status.COMPLETED
 
     def set_node_attribute(self, node_id, attribute, value) -> None:
-        nx.set_node_attributes(self.graph, {node_id: value}, attribute)
+        if node_id in self._attrs:
+            self._attrs[node_id][attribute] = value
 
     def set_node_attributes(self, node_id, attr_val) -> None:
-        nx.set_node_attributes(self.graph, {node_id: attr_val})
+        if node_id in self._attrs:
+            self._attrs[node_id].update(attr_val)
 
     def is_empty(self) -> bool:
-        return self.graph.number_of_nodes() == 0
+        return not self.nodes
@@ -1,23 +1,68 @@
 # type:ignore
 import asyncio
-import json
 import os
+import re
+import time
 
 from contextlib import asynccontextmanager
 
+import anyio
 import click
+import orjson
 
 from fastmcp.utilities.logging import get_logger
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
-from mcp.types import CallToolResult, ReadResourceResult
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, ReadResourceResult
 
 
 logger = get_logger(__name__)
 
 env = {}
 
+# Pooled sessions are reconnected once they are older than this many seconds.
+SESSION_TTL = 300.0
+
+# Errors that mean the session's streams are gone, not that one call failed.
+_TRANSPORT_ERRORS = (
+    anyio.BrokenResourceError,
+    anyio.ClosedResourceError,
+    anyio.EndOfStream,
+)
+
+
+class _PooledSession:
+    """A pooled session, the task holding it open and its current users.
+
+    An entry leaves the pool when it expires or breaks, but its holder is
+    only cancelled once no caller is still using the session.
+    """
+
+    def __init__(self, host, port, transport):
+        self.ready = asyncio.get_running_loop().create_future()
+        self.task = asyncio.create_task(
+            _hold_session(host, port, transport, self.ready)
+        )
+        self.created = time.monotonic()
+        self.users = 0
+        self.retired = False
+
+    def expired(self) -> bool:
+        return (
+            self.task.done() or time.monotonic() - self.created > SESSION_TTL
+        )
+
+    async def close(self) -> None:
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+# (host, port, transport) -> the current pooled session.
+_SESSION_POOL: dict[tuple, _PooledSession] = {}
+_session_pool_lock = asyncio.Lock()
+
 
 @asynccontextmanager
 async def init_session(host, port, transport):
@@ -75,6 +120,109 @@ async def init_session(host, port, transport):
         )
 
 
+async def _hold_session(host, port, transport, ready: asyncio.Future) -> None:
+    # The SSE and stdio transports run on anyio task groups, which must be
+    # entered and exited by the same task, so a dedicated task owns each
+    # pooled session for its whole lifetime and is cancelled to close it.
+    try:
+        async with init_session(host, port, transport) as session:
+            ready.set_result(session)
+            await asyncio.Future()
+    except Exception as e:
+        if ready.done():
+            logger.warning(f'Pooled MCP session closed: {e}')
+        else:
+            ready.set_exception(e)
+    finally:
+        # Cancelled before connecting: callers waiting on ready must not hang.
+        if not ready.done():
+            ready.set_exception(
+                ConnectionError('MCP session closed before it was ready')
+            )
+
+
+def _retire(key, entry: _PooledSession) -> None:
+    if _SESSION_POOL.get(key) is entry:
+        del _SESSION_POOL[key]
+    entry.retired = True
+
+
+async def _acquire(key, host, port, transport):
+    async with _session_pool_lock:
+        entry = _SESSION_POOL.get(key)
+        if entry is not None and entry.expired():
+            _retire(key, entry)
+            if not entry.users:
+                await entry.close()
+            entry = None
+        if entry is None:
+            entry = _PooledSession(host, port, transport)
+            _SESSION_POOL[key] = entry
+        entry.users += 1
+    try:
+        return entry, await asyncio.shield(entry.ready)
+    except asyncio.CancelledError:
+        await _release(key, entry, broken=False)
+        raise
+    except Exception:
+        await _release(key, entry, broken=True)
+        raise
+
+
+async def _release(key, entry: _PooledSession, broken: bool) -> None:
+    async with _session_pool_lock:
+        entry.users -= 1
+        if broken:
+            _retire(key, entry)
+        if entry.retired and not entry.users:
+            await entry.close()
+
+
+async def close_sessions() -> None:
+    """Closes every pooled session, including ones still in use."""
+    async with _session_pool_lock:
+        entries = list(_SESSION_POOL.items())
+        for key, entry in entries:
+            _retire(key, entry)
+            await entry.close()
+
+
+@asynccontextmanager
+async def pooled_session(host, port, transport):
+    """Yields a pooled ClientSession for (host, port, transport).
+
+    Unlike init_session, leaving the block keeps the connection open for
+    the next caller, so repeated tool calls skip the connect and initialize
+    handshake. Sessions older than SESSION_TTL are replaced for new callers
+    and closed once their last user leaves. A transport failure such as
+    anyio.ClosedResourceError retires the session so the next caller
+    reconnects; other errors leave it in the pool.
+
+    Args:
+        host: The hostname or IP address of the MCP server (used for SSE).
+        port: The port number of the MCP server (used for SSE).
+        transport: The communication transport to use ('sse' or 'stdio').
+
+    Yields:
+        ClientSession: An initialized MCP client session.
+    """
+    key = (host, str(port), transport)
+    entry, session = await _acquire(key, host, port, transport)
+    broken = False
+    try:
+        yield session
+    except _TRANSPORT_ERRORS:
+        broken = True
+        raise
+    except McpError as e:
+        # A JSON-RPC error from one tool call leaves the session usable;
+        # only a closed connection retires it.
+        broken = e.error.code == CONNECTION_CLOSED
+        raise
+    finally:
+        await _release(key, entry, broken)
+
+
 async def find_agent(session: ClientSession, query) -> CallToolResult:
     """Calls the 'find_agent' tool on the connected MCP server.
 
@@ -94,6 +242,28 @@ async def find_agent(session: ClientSession, query) -> CallToolResult:
     )
 
 
+_LEADING_WS = re.compile(r'\s*')
+_JSON_CLOSERS = {'{': '}', '[': ']'}
+
+
+def _text_bounds(text: str) -> tuple[int, int]:
+    """Returns (start, end) of text without surrounding whitespace.
+
+    Avoids the copy text.strip() would make of a large payload.
+    """
+    start = _LEADING_WS.match(text).end()
+    end = len(text)
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _looks_like_json(text: str, start: int, end: int) -> bool:
+    # A document that opens with { or [ but does not close with the
+    # matching bracket is truncated, so it is not worth parsing.
+    return _JSON_CLOSERS.get(text[start]) == text[end - 1]
+
+
 def _extract_json_from_call(result: CallToolResult):  # type: ignore
     """Best-effort extraction of JSON/dict data from a CallToolResult.
 
@@ -108,24 +278,26 @@ def _extract_json_from_call(result: CallToolResult):  # type: ignore
             logger.warning('CallToolResult has no content entries')
             return None
         first = result.content[0]
-        # Some MCP libs may attach already parsed objects under .data or .json
-        if hasattr(first, 'json'):  # type: ignore[attr-defined]
-            json_attr = getattr(first, 'json')
-            if callable(json_attr):
-                try:
-                    return json_attr()
-                except Exception:
-                    logger.warning('Failed to call json() method', exc_info=True)
-            elif json_attr:
-                return json_attr
-        # Check for model_dump_json method (newer Pydantic)
-        if hasattr(first, 'model_dump_json'):  # type: ignore[attr-defined]
-            try:
-                return getattr(first, 'model_dump_json')()
-            except Exception:
-                logger.warning('Failed to call model_dump_json() method', exc_info=True)
+        # TextContent carries the payload in .text; every pydantic model also
+        # has json()/model_dump_json(), so those are only a fallback.
         text = getattr(first, 'text', None)
         if text is None:
+            # Some MCP libs may attach already parsed objects under .json
+            if hasattr(first, 'json'):  # type: ignore[attr-defined]
+                json_attr = getattr(first, 'json')
+                if callable(json_attr):
+                    try:
+                        return json_attr()
+                    except Exception:
+                        logger.warning('Failed to call json() method', exc_info=True)
+                elif json_attr:
+                    return json_attr
+            # Check for model_dump_json method (newer Pydantic)
+            if hasattr(first, 'model_dump_json'):  # type: ignore[attr-defined]
+                try:
+                    return getattr(first, 'model_dump_json')()
+                except Exception:
+                    logger.warning('Failed to call model_dump_json() method', exc_info=True)
             logger.warning('First content entry has no text attribute')
             return None
         if isinstance(text, (dict, list)):
@@ -133,19 +305,20 @@ def _extract_json_from_call(result: CallToolResult):  # type: ignore
         if not isinstance(text, str):
             logger.warning(f'Unexpected content.text type {type(text)}')
             return None
-        stripped = text.strip()
-        if not stripped:
+        start, end = _text_bounds(text)
+        if start == end:
             logger.warning('Content text is empty after stripping')
             return None
-        # If it already looks like JSON try to parse
-        if stripped[0] in '{[':
+        # If it already looks like JSON try to parse; JSON allows the
+        # surrounding whitespace, so the unstripped text is parsed as is.
+        if _looks_like_json(text, start, end):
             try:
-                return json.loads(stripped)
-            except json.JSONDecodeError:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
                 logger.error('Failed to decode JSON from tool result text', exc_info=True)
                 return None
         # Otherwise return raw text
-        return stripped
+        return text[start:end]
     except Exception:
         logger.error('Unexpected error extracting JSON from call result', exc_info=True)
         return None
@@ -162,16 +335,16 @@ def _extract_json_from_resource(result: ReadResourceResult):  # type: ignore
             return text
         if not isinstance(text, str):
             return None
-        stripped = text.strip()
-        if not stripped:
+        start, end = _text_bounds(text)
+        if start == end:
             return None
-        if stripped[0] in '{[':
+        if _looks_like_json(text, start, end):
             try:
-                return json.loads(stripped)
-            except json.JSONDecodeError:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
                 logger.error('Failed to decode JSON from resource result text', exc_info=True)
                 return None
-        return stripped
+        return text[start:end]
     except Exception:
         logger.error('Unexpected error extracting JSON from resource result', exc_info=True)
         return None
@@ -255,6 +428,18 @@ async def query_db(session: ClientSession) -> CallToolResult:
     )
 
 
+def _log_json(data) -> None:
+    """Logs extracted tool/resource data as indented JSON when possible."""
+    if data is None:
+        logger.info(data)
+        return
+    try:
+        logger.info(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+    except TypeError as e:
+        logger.error(f'Failed to serialize data to JSON: {e}')
+        logger.info(f'Raw data: {data}')
+
+
 # Test util
 async def main(host, port, transport, query, resource, tool):
     """Main asynchronous function to connect to the MCP server and execute commands.
@@ -274,40 +459,20 @@ async def main(host, port, transport, query, resource, tool):
     async with init_session(host, port, transport) as session:
         if query:
             result = await find_agent(session, query)
-            data = _extract_json_from_call(result)
-            try:
-                logger.info(json.dumps(data, indent=2) if data is not None else data)
-            except TypeError as e:
-                logger.error(f'Failed to serialize data to JSON: {e}')
-                logger.info(f'Raw data: {data}')
+            _log_json(_extract_json_from_call(result))
         if resource:
             result = await find_resource(session, resource)
-            data = _extract_json_from_resource(result)
-            try:
-                logger.info(json.dumps(data, indent=2) if data is not None else data)
-            except TypeError as e:
-                logger.error(f'Failed to serialize data to JSON: {e}')
-                logger.info(f'Raw data: {data}')
+            _log_json(_extract_json_from_resource(result))
         if tool:
             if tool == 'search_flights':
                 results = await search_flights(session)
                 logger.info(results.model_dump())
             if tool == 'search_hotels':
                 result = await search_hotels(session)
-                data = _extract_json_from_call(result)
-                try:
-                    logger.info(json.dumps(data, indent=2) if data is not None else data)
-                except TypeError as e:
-                    logger.error(f'Failed to serialize data to JSON: {e}')
-                    logger.info(f'Raw data: {data}')
+                _log_json(_extract_json_from_call(result))
             if tool == 'query_db':
                 result = await query_db(session)
-                data = _extract_json_from_call(result)
-                try:
-                    logger.info(json.dumps(data, indent=2) if data is not None else data)
-                except TypeError as e:
-                    logger.error(f'Failed to serialize data to JSON: {e}')
-                    logger.info(f'Raw data: {data}')
+                _log_json(_extract_json_from_call(result))
 
 
 # Command line tester
@@ -1,27 +1,141 @@
 # type: ignore
+import asyncio
+import copy
+import hashlib
 import json
 import os
+import re
 import sqlite3
+import threading
+import time
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
-import pandas as pd
-import requests
-from llama_index.embeddings.dashscope import DashScopeEmbedding
+import httpx
+import orjson
 
 from a2a_mcp.common.utils import init_api_key
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
+from mcp.types import CallToolResult, TextContent
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from llama_index.embeddings.dashscope import DashScopeEmbedding
 
 logger = get_logger(__name__)
 AGENT_CARDS_DIR = 'agent_cards'
 MODEL = 'text-embedding-v2'  # DashScope embedding model per user sample
 SQLLITE_DB = 'travel_agency.db'
 PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
+# Only read-only queries reach the travel DB; matching the leading keyword
+# avoids copying and upper-casing the whole query.
+_SELECT_PREFIX = re.compile(r'\s*SELECT', re.IGNORECASE)
+# Card embeddings keyed by (model, sha256 of the card JSON), reused across
+# restarts so unchanged cards are not re-embedded. Stored as plain arrays
+# and loaded with allow_pickle=False.
+EMBED_CACHE_PATH = Path('.cache/agent_card_embeddings.npz')
+# Agent-card files keyed by filename: [mtime they were read at, parsed card,
+# original text]. Kept as JSON so a stale or foreign file cannot run code.
+CARD_CACHE_PATH = Path('.cache/cards.json')
 
 _embedder: "DashScopeEmbedding | None" = None  # lazy init in generate_embedding
 
+# One pooled client for Places calls, so repeated searches reuse the TLS
+# connection instead of reconnecting per tool call. Created on the first
+# call, once FastMCP's event loop is running.
+_places_client: httpx.AsyncClient | None = None
+
+
+def _get_places_client() -> httpx.AsyncClient:
+    global _places_client
+    if _places_client is None or _places_client.is_closed:
+        _places_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=50,
+                keepalive_expiry=30.0,
+            ),
+            http2=True,
+        )
+    return _places_client
+
+
+class _ToolResultCache:
+    """Bounded LRU of tool results that expire after `ttl` seconds.
+
+    Hits return a deep copy, so callers cannot mutate the cached value.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: tuple, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_db_local = threading.local()
+
+
+def _get_db_conn() -> sqlite3.Connection:
+    """Returns this thread's read-only connection to the travel DB.
+
+    Keeping it open preserves SQLite's page cache between queries.
+    """
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(
+            f'file:{SQLLITE_DB}?mode=ro', uri=True, isolation_level=None
+        )
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA mmap_size=268435456')
+        _db_local.conn = conn
+    return conn
+
+
+# Place searches change slowly, so results are reused for a few minutes.
+# Travel-DB availability is always read live.
+_places_cache = _ToolResultCache(maxsize=1024, ttl=300.0)
+
+
+def _tool_result(payload, cache_hint: str) -> CallToolResult:
+    """Wraps a tool payload as JSON text with a client cache hint.
+
+    'cache' marks results that are stable for the same arguments (the
+    server reuses them too), while 'no-cache' marks live data and errors.
+    """
+    return CallToolResult(
+        content=[
+            TextContent(type='text', text=orjson.dumps(payload, default=str).decode())
+        ],
+        _meta={'cache_hint': cache_hint},
+    )
+
 
 def _mock_places_response(query: str, max_results: int = 5) -> dict:
     """Generate a small, deterministic mock response that resembles
@@ -58,6 +172,10 @@ def generate_embedding(texts: str | list[str]) -> list[float] | list[list[float]
     """
     global _embedder
     if _embedder is None:
+        # llama_index pulls in a large dependency graph; only load it once
+        # an embedding is actually needed.
+        from llama_index.embeddings.dashscope import DashScopeEmbedding
+
         key = os.getenv('DASHSCOPE_API_KEY') or os.getenv('OPENAI_API_KEY')
         if not key:
             raise RuntimeError('DashScope API key not set (DASHSCOPE_API_KEY/OPENAI_API_KEY).')
@@ -75,54 +193,275 @@ def generate_embedding(texts: str | list[str]) -> list[float] | list[list[float]
         raise
 
 
+def _load_card_cache() -> dict[str, list]:
+    try:
+        return orjson.loads(CARD_CACHE_PATH.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f'Ignoring unreadable agent card cache: {e}')
+        return {}
+
+
+def _save_card_cache(cache: dict[str, list]) -> None:
+    tmp_path = CARD_CACHE_PATH.with_suffix('.tmp')
+    try:
+        CARD_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(orjson.dumps(cache))
+        os.replace(tmp_path, CARD_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f'Could not write agent card cache: {e}')
+
+
+# Concurrent find_agent queries are embedded and scored together: queries
+# arriving within EMBED_BATCH_WINDOW seconds share one DashScope request of
+# up to EMBED_MAX_BATCH texts.
+EMBED_BATCH_WINDOW = 0.010
+EMBED_MAX_BATCH = 25
+
+
+class _MicroBatcher:
+    """Coalesces concurrent calls into batched calls of a blocking function.
+
+    Items submitted within `window` seconds of each other are passed to
+    `fn` together, at most `max_batch` at a time, in a worker thread. `fn`
+    maps a list of items to a list of results in the same order.
+    """
+
+    def __init__(
+        self,
+        fn,
+        window: float = EMBED_BATCH_WINDOW,
+        max_batch: int = EMBED_MAX_BATCH,
+    ):
+        self.fn = fn
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: list[tuple[object, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch = self._pending[: self.max_batch]
+        del self._pending[: self.max_batch]
+        loop = asyncio.get_running_loop()
+        if self._pending:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        task = loop.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[object, asyncio.Future]]) -> None:
+        try:
+            results = await asyncio.to_thread(
+                self.fn, [item for item, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+def score_queries(
+    matrix_int8: 'np.ndarray', scales: 'np.ndarray', queries: list[str]
+) -> list['np.ndarray']:
+    """Returns each query's cosine similarity to every card.
+
+    All queries are embedded in one request and scored with a single int8
+    matrix product, accumulated in int32. The per-row card scales differ,
+    so they are applied before any argmax.
+    """
+    import numpy as np
+
+    q = np.asarray(generate_embedding(queries), dtype=np.float32)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    q_int8, q_scales = _quantize_int8(q)
+    raw = np.matmul(matrix_int8, q_int8.T, dtype=np.int32)
+    scores = raw * scales[:, None] * q_scales
+    return list(scores.T)
+
+
+def _read_card(filename: str) -> tuple[dict, str] | None:
+    """Reads one agent card file as (parsed card, original text).
+
+    Logs and returns None on failure.
+    """
+    logger.info(f'Reading file: {filename}')
+    try:
+        raw = (Path(AGENT_CARDS_DIR) / filename).read_bytes()
+        return orjson.loads(raw), raw.decode('utf-8')
+    except orjson.JSONDecodeError as jde:
+        logger.error(f'JSON Decoder Error {jde}')
+    except OSError as e:
+        logger.error(f'Error reading file {filename}: {e}.')
+    except Exception as e:
+        logger.error(
+            f'An unexpected error occurred processing {filename}: {e}',
+            exc_info=True,
+        )
+    return None
+
+
 def load_agent_cards():
     """Loads agent card data from JSON files within a specified directory.
 
+    Files whose modification time matches the on-disk card cache are not
+    re-read or re-parsed; the others are read in parallel.
+
     Returns:
-        A list containing JSON data from an agent card file found in the specified directory.
-        Returns an empty list if the directory is empty, contains no '.json' files,
-        or if all '.json' files encounter errors during processing.
+        A tuple of (card URIs, agent card dicts, card file texts) for the
+        '.json' files found in the specified directory. All lists are empty
+        if the directory is missing, contains no '.json' files, or if all
+        '.json' files encounter errors during processing.
     """
     card_uris = []
     agent_cards = []
+    card_texts = []
     dir_path = Path(AGENT_CARDS_DIR)
     if not dir_path.is_dir():
         logger.error(
             f'Agent cards directory not found or is not a directory: {AGENT_CARDS_DIR}'
         )
-        return agent_cards
+        return card_uris, agent_cards, card_texts
 
     logger.info(f'Loading agent cards from card repo: {AGENT_CARDS_DIR}')
 
-    for filename in os.listdir(AGENT_CARDS_DIR):
-        if filename.lower().endswith('.json'):
-            file_path = dir_path / filename
-
-            if file_path.is_file():
-                logger.info(f'Reading file: {filename}')
-                try:
-                    with file_path.open('r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        card_uris.append(
-                            f'resource://agent_cards/{Path(filename).stem}'
-                        )
-                        agent_cards.append(data)
-                except json.JSONDecodeError as jde:
-                    logger.error(f'JSON Decoder Error {jde}')
-                except OSError as e:
-                    logger.error(f'Error reading file {filename}: {e}.')
-                except Exception as e:
-                    logger.error(
-                        f'An unexpected error occurred processing {filename}: {e}',
-                        exc_info=True,
-                    )
+    cache = _load_card_cache()
+    # (filename, mtime_ns, (card, text) or None when it must be read)
+    found = []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            filename = entry.name
+            if not filename.lower().endswith('.json'):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                mtime_ns = entry.stat().st_mtime_ns
+            except OSError as e:
+                logger.error(f'Error reading file {filename}: {e}.')
+                continue
+            cached = cache.get(filename)
+            data = (
+                cached[1:]
+                if isinstance(cached, list)
+                and len(cached) == 3
+                and cached[0] == mtime_ns
+                else None
+            )
+            found.append((filename, mtime_ns, data))
+
+    # Changed cards are read and parsed in parallel; the rest come from cache.
+    stale = [filename for filename, _, data in found if data is None]
+    loaded = {}
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(32, len(stale))) as pool:
+            loaded = dict(zip(stale, pool.map(_read_card, stale), strict=True))
+
+    fresh_cache = {}
+    for filename, mtime_ns, data in found:
+        if data is None:
+            data = loaded[filename]
+            if data is None:
+                continue
+        card, text = data
+        fresh_cache[filename] = [mtime_ns, card, text]
+        card_uris.append(f'resource://agent_cards/{Path(filename).stem}')
+        agent_cards.append(card)
+        card_texts.append(text)
+    if fresh_cache != cache:
+        _save_card_cache(fresh_cache)
     logger.info(
         f'Finished loading agent cards. Found {len(agent_cards)} cards.'
     )
-    return card_uris, agent_cards
+    return card_uris, agent_cards, card_texts
+
+
+def _load_embedding_cache() -> dict[tuple[str, str], list[float]]:
+    if not EMBED_CACHE_PATH.is_file():
+        return {}
+    import numpy as np
+
+    try:
+        with np.load(EMBED_CACHE_PATH, allow_pickle=False) as cached:
+            return dict(
+                zip(
+                    zip(cached['model'].tolist(), cached['sha'].tolist()),
+                    cached['embedding'].tolist(),
+                    strict=True,
+                )
+            )
+    except Exception as e:
+        logger.warning(f'Ignoring unreadable embedding cache: {e}')
+        return {}
+
+
+def _save_embedding_cache(cache: dict[tuple[str, str], list[float]]) -> None:
+    import numpy as np
+
+    tmp_path = EMBED_CACHE_PATH.with_suffix('.tmp')
+    try:
+        EMBED_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open('wb') as f:
+            np.savez(
+                f,
+                model=np.array([model for model, _ in cache]),
+                sha=np.array([sha for _, sha in cache]),
+                embedding=np.asarray(list(cache.values()), dtype=np.float32),
+            )
+        os.replace(tmp_path, EMBED_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f'Could not write embedding cache: {e}')
+
+
+def embed_with_cache(json_blobs: list[str]) -> list[list[float]]:
+    """Embeds json_blobs, calling DashScope only for blobs not seen before."""
+    cache = _load_embedding_cache()
+    keys = [
+        (MODEL, hashlib.sha256(blob.encode()).hexdigest()) for blob in json_blobs
+    ]
+    missing = [i for i, key in enumerate(keys) if key not in cache]
+    if missing:
+        logger.info(f'Embedding {len(missing)} of {len(keys)} agent cards')
+        new_embeddings = generate_embedding([json_blobs[i] for i in missing])
+        for i, embedding in zip(missing, new_embeddings, strict=True):
+            cache[keys[i]] = embedding
+        # Only the current cards are kept, so edited cards do not pile up.
+        _save_embedding_cache({key: cache[key] for key in keys})
+    return [cache[key] for key in keys]
+
 
+def _quantize_int8(values: 'np.ndarray') -> tuple['np.ndarray', 'np.ndarray']:
+    """Symmetrically quantizes the last axis of values to int8.
 
-def build_agent_card_embeddings() -> pd.DataFrame:
+    Returns the int8 values and the float32 scale(s) that map them back.
+    """
+    import numpy as np
+
+    scale = np.max(np.abs(values), axis=-1, keepdims=True) / 127.0
+    scale[scale == 0] = 1.0
+    quantized = np.round(values / scale).astype(np.int8)
+    return quantized, np.squeeze(scale, axis=-1).astype(np.float32)
+
+
+def build_agent_card_embeddings() -> 'pd.DataFrame':
     """Loads agent cards, generates embeddings for them, and returns a DataFrame.
 
     Returns:
@@ -131,17 +470,30 @@ def build_agent_card_embeddings() -> pd.DataFrame:
         if no agent cards were loaded initially or if an exception occurred
         during the embedding generation process.
     """
-    card_uris, agent_cards = load_agent_cards()
+    # numpy and pandas are only needed once the card index is built.
+    import numpy as np
+    import pandas as pd
+
+    card_uris, agent_cards, card_texts = load_agent_cards()
     logger.info('Generating Embeddings for agent cards')
     try:
         if agent_cards:
             df = pd.DataFrame(
                 {'card_uri': card_uris, 'agent_card': agent_cards}
             )
-            # Prepare JSON string versions for embedding
-            json_blobs = [json.dumps(card) for card in df['agent_card']]
-            embeddings = generate_embedding(json_blobs)  # returns list[list[float]]
+            # The card files are already JSON text, so they are embedded
+            # as read instead of being serialized again.
+            embeddings = embed_with_cache(card_texts)
             df['card_embeddings'] = embeddings
+            # Contiguous, row-normalized matrix so find_agent is a single
+            # matrix-vector product with no per-query stacking. Rows are
+            # stored as int8 with a per-row scale, a quarter of the float32
+            # footprint.
+            matrix = np.asarray(embeddings, dtype=np.float32, order='C')
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix_int8, scales = _quantize_int8(matrix)
+            df.attrs['embedding_int8'] = matrix_int8
+            df.attrs['embedding_scales'] = scales
             logger.info('Done generating embeddings for agent cards')
             return df
         logger.info('No agent cards loaded; skipping embedding generation')
@@ -166,27 +518,42 @@ def serve(host, port, transport):  # noqa: PLR0915
     mcp = FastMCP('agent-cards', host=host, port=port)
 
     df = build_agent_card_embeddings()
+    # Card lookup by URI for resource reads, instead of a column scan.
+    card_by_uri = (
+        {} if df is None else dict(zip(df['card_uri'], df['agent_card']))
+    )
+    card_uris = list(card_by_uri)
+    card_scorer = _MicroBatcher(
+        partial(
+            score_queries,
+            df.attrs.get('embedding_int8') if df is not None else None,
+            df.attrs.get('embedding_scales') if df is not None else None,
+        )
+    )
 
     @mcp.tool(
         name='find_agent',
         description='Finds the most relevant agent card based on a natural language query string.',
     )
-    def find_agent(query: str) -> dict:
+    async def find_agent(query: str, k: int = 1) -> CallToolResult:
         """Finds the most relevant agent card based on a query string.
 
         This function takes a user query, typically a natural language question or a task generated by an agent,
         generates its embedding, and compares it against the
         pre-computed embeddings of the loaded agent cards. It uses the dot
-        product to measure similarity and identifies the agent card with the
+        product of the normalized embeddings to measure similarity and identifies the agent card with the
         highest similarity score.
 
         Args:
             query: The natural language query string used to search for a
                    relevant agent.
+            k: How many of the best matching agent cards to return.
 
         Returns:
             The json representing the agent card deemed most relevant
-            to the input query based on embedding similarity.
+            to the input query based on embedding similarity, or a list of
+            the k most relevant cards, best first, when k > 1. The result is
+            marked cacheable, since it only changes with the card corpus.
         """
         # Validate that embeddings dataframe exists and has data
         if df is None or df.empty:
@@ -194,14 +561,9 @@ def serve(host, port, transport):  # noqa: PLR0915
                 'No agent cards available. Ensure agent card JSON files exist in the agent_cards directory.'
             )
 
-        # Generate query embedding
-        query_embedding = generate_embedding(query)
-
-        # Compute similarity (dot product) and select best match
+        # Embed and score the query, batched with concurrent calls
         try:
-            dot_products = np.dot(
-                np.stack(df['card_embeddings']), query_embedding
-            )
+            dot_products = await card_scorer.submit(query)
         except Exception as e:
             logger.error(
                 f'Error computing similarity for query "{query}": {e}',
@@ -209,15 +571,27 @@ def serve(host, port, transport):  # noqa: PLR0915
             )
             raise
 
-        best_match_index = int(np.argmax(dot_products))
-        logger.debug(
-            f'Found best match at index {best_match_index} with score {dot_products[best_match_index]}'
+        if k <= 1:
+            best_match_index = int(dot_products.argmax())
+            logger.debug(
+                f'Found best match at index {best_match_index} with score {dot_products[best_match_index]}'
+            )
+            return _tool_result(df.iloc[best_match_index]['agent_card'], 'cache')
+
+        # Partition out the top k in linear time, then order just those.
+        neg_scores = -dot_products
+        if k < len(neg_scores):
+            top = neg_scores.argpartition(k - 1)[:k]
+        else:
+            top = neg_scores.argsort()
+        top = top[neg_scores[top].argsort()]
+        logger.debug(f'Found top {len(top)} matches at indices {top.tolist()}')
+        return _tool_result(
+            [df.iloc[int(i)]['agent_card'] for i in top], 'cache'
         )
-        # Return the dict directly; FastMCP will serialize it to JSON text content.
-        return df.iloc[best_match_index]['agent_card']
 
     @mcp.tool()
-    def query_places_data(query: str):
+    async def query_places_data(query: str) -> CallToolResult:
         """Query Google Places."""
         logger.info(f'Search for places : {query}')
         # Allow forcing mock responses for testing: set MOCK_PLACES=1
@@ -229,7 +603,9 @@ def serve(host, port, transport):  # noqa: PLR0915
                 logger.info('GOOGLE_PLACES_API_KEY is not set, using mock places response')
             else:
                 logger.info('MOCK_PLACES=1 detected, using mock places response')
-            return _mock_places_response(query, max_results=10)
+            return _tool_result(
+                _mock_places_response(query, max_results=10), 'cache'
+            )
 
         headers = {
             'X-Goog-Api-Key': api_key,
@@ -242,20 +618,27 @@ def serve(host, port, transport):  # noqa: PLR0915
             'maxResultCount': 10,
         }
 
+        cache_key = ('query_places_data', query)
+        cached = _places_cache.get(cache_key)
+        if cached is not None:
+            return _tool_result(cached, 'cache')
+
         try:
-            response = requests.post(
+            response = await _get_places_client().post(
                 PLACES_API_URL, headers=headers, json=payload
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
+            result = response.json()
+            _places_cache.put(cache_key, copy.deepcopy(result))
+            return _tool_result(result, 'cache')
+        except httpx.HTTPStatusError as http_err:
             logger.info(f'HTTP error occurred: {http_err}')
             logger.info(f'Response content: {response.text}')
-        except requests.exceptions.ConnectionError as conn_err:
+        except httpx.ConnectError as conn_err:
             logger.info(f'Connection error occurred: {conn_err}')
-        except requests.exceptions.Timeout as timeout_err:
+        except httpx.TimeoutException as timeout_err:
             logger.info(f'Timeout error occurred: {timeout_err}')
-        except requests.exceptions.RequestException as req_err:
+        except httpx.RequestError as req_err:
             logger.info(
                 f'An unexpected error occurred with the request: {req_err}'
             )
@@ -264,10 +647,10 @@ def serve(host, port, transport):  # noqa: PLR0915
                 f'Failed to decode JSON response. Raw response: {response.text}'
             )
 
-        return {'places': []}
+        return _tool_result({'places': []}, 'no-cache')
 
     @mcp.tool()
-    def query_travel_data(query: str) -> dict:
+    def query_travel_data(query: str) -> CallToolResult:
         """ "name": "query_travel_data",
         "description": "Retrieves the most up-to-date, ariline, hotel and car rental availability. Helps with the booking.
         This tool should be used when a user asks for the airline ticket booking, hotel or accommodation booking, or car rental reservations.",
@@ -285,26 +668,30 @@ def serve(host, port, transport):  # noqa: PLR0915
         # The above is to influence gemini to pickup the tool.
         logger.info(f'Query sqllite : {query}')
 
-        if not query or not query.strip().upper().startswith('SELECT'):
+        if not query or not _SELECT_PREFIX.match(query):
             raise ValueError(f'In correct query {query}')
 
         try:
-            with sqlite3.connect(SQLLITE_DB) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                result = {'results': [dict(row) for row in rows]}
-                # Return dict (not JSON string) for consistency with other tools
-                return result
+            cursor = _get_db_conn().execute(query)
+            cols = [d[0] for d in cursor.description]
+            # Plain tuples zipped with the column names, fetched in
+            # batches, so the full result set is never held twice.
+            rows = []
+            while batch := cursor.fetchmany(1024):
+                rows.extend(map(dict, map(partial(zip, cols), batch)))
+            # Live data, so clients are told not to cache it
+            return _tool_result({'results': rows}, 'no-cache')
         except Exception as e:
             logger.error(f'Exception running query {e}')
             logger.error(traceback.format_exc())
-            if 'no such column' in e:
-                return {
-                    'error': f'Please check your query, {e}. Use the table schema to regenerate the query'
-                }
-            return {'error': {e}}
+            if isinstance(e, sqlite3.OperationalError) and 'no such column' in str(e):
+                return _tool_result(
+                    {
+                        'error': f'Please check your query, {e}. Use the table schema to regenerate the query'
+                    },
+                    'no-cache',
+                )
+            return _tool_result({'error': str(e)}, 'no-cache')
 
     @mcp.resource('resource://agent_cards/list', mime_type='application/json')
     def get_agent_cards() -> dict:
@@ -318,10 +705,8 @@ def serve(host, port, transport):  # noqa: PLR0915
             list containing all the loaded agent card dictionaries. Returns
             {'agent_cards': []} if the data cannot be retrieved.
         """
-        resources = {}
         logger.info('Starting read resources')
-        resources['agent_cards'] = df['card_uri'].to_list()
-        return resources
+        return {'agent_cards': card_uris}
 
     @mcp.resource(
         'resource://agent_cards/{card_name}', mime_type='application/json'
@@ -339,12 +724,8 @@ def serve(host, port, transport):  # noqa: PLR0915
         logger.info(
             f'Starting read resource resource://agent_cards/{card_name}'
         )
-        resources['agent_card'] = (
-            df.loc[
-                df['card_uri'] == f'resource://agent_cards/{card_name}',
-                'agent_card',
-            ]
-        ).to_list()
+        card = card_by_uri.get(f'resource://agent_cards/{card_name}')
+        resources['agent_card'] = [] if card is None else [card]
 
         return resources
 
@@ -1,7 +1,15 @@
-import json
+import asyncio
+import hashlib
 import os
 import sys
-import urllib.request
+import time
+
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+import orjson
 
 
 DEFAULT_MODEL_ID = "gemini-2.0-flash-lite"
@@ -11,35 +19,164 @@ API_ENDPOINT = (
 )
 
 
-def call_gemini(api_key: str, model: str, prompt: str, timeout: float = 20.0) -> str:
-	url = API_ENDPOINT.format(model=model, api_key=api_key)
-	payload = {
-		"contents": [
-			{
-				"role": "user",
-				"parts": [
-					{"text": prompt},
-				],
-			}
-		]
-	}
-	data = json.dumps(payload).encode("utf-8")
-	req = urllib.request.Request(
-		url,
-		data=data,
-		headers={"Content-Type": "application/json"},
-		method="POST",
+# Shared clients keep the TLS connection to the API open between calls. The
+# async client belongs to the event loop that created it and is replaced when
+# called from another loop. Call close() / aclose() when done.
+_LIMITS = httpx.Limits(max_keepalive_connections=4)
+_SESSION = httpx.Client(limits=_LIMITS)
+_ASYNC_SESSION: httpx.AsyncClient | None = None
+_ASYNC_LOOP: asyncio.AbstractEventLoop | None = None
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Responses are cached per (model, prompt) in memory for the process. Setting
+# GEMINI_CACHE_DIR also keeps them on disk across runs, for up to
+# GEMINI_CACHE_TTL seconds. Pass use_cache=False to always hit the API.
+_cache_dir = os.environ.get("GEMINI_CACHE_DIR")
+CACHE_DIR = Path(_cache_dir) if _cache_dir else None
+CACHE_TTL = float(os.environ.get("GEMINI_CACHE_TTL", "86400"))
+MEMORY_CACHE_SIZE = 1024
+_memory_cache: OrderedDict[str, str] = OrderedDict()
+
+
+@lru_cache(maxsize=16)
+def _url_for(model: str, api_key: str) -> str:
+	return API_ENDPOINT.format(model=model, api_key=api_key)
+
+
+def _encode_payload(prompt: str) -> bytes:
+	return orjson.dumps(
+		{
+			"contents": [
+				{
+					"role": "user",
+					"parts": [
+						{"text": prompt},
+					],
+				}
+			]
+		}
 	)
-	with urllib.request.urlopen(req, timeout=timeout) as resp:
-		body = resp.read()
-	obj = json.loads(body.decode("utf-8"))
-	# Extract first candidate text if available
+
+
+def _candidate_text(obj: dict) -> str | None:
+	# First candidate text, or None for blocked / empty responses
 	try:
 		parts = obj["candidates"][0]["content"]["parts"]
 		texts = [p.get("text", "") for p in parts]
 		return "".join(texts).strip()
 	except Exception:
-		return json.dumps(obj, ensure_ascii=False)
+		return None
+
+
+def _cache_key(model: str, prompt: str) -> str:
+	return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> str | None:
+	text = _memory_cache.get(key)
+	if text is not None:
+		_memory_cache.move_to_end(key)
+		return text
+	if CACHE_DIR is None:
+		return None
+	path = CACHE_DIR / key
+	try:
+		if time.time() - path.stat().st_mtime > CACHE_TTL:
+			return None
+		text = path.read_text(encoding="utf-8")
+	except OSError:
+		return None
+	_cache_put(key, text, persist=False)
+	return text
+
+
+def _cache_put(key: str, text: str, persist: bool = True) -> None:
+	_memory_cache[key] = text
+	_memory_cache.move_to_end(key)
+	if len(_memory_cache) > MEMORY_CACHE_SIZE:
+		_memory_cache.popitem(last=False)
+	if persist and CACHE_DIR is not None:
+		try:
+			CACHE_DIR.mkdir(parents=True, exist_ok=True)
+			(CACHE_DIR / key).write_text(text, encoding="utf-8")
+		except OSError:
+			pass
+
+
+def call_gemini(
+	api_key: str,
+	model: str,
+	prompt: str,
+	timeout: float = 20.0,
+	use_cache: bool = True,
+) -> str:
+	key = _cache_key(model, prompt) if use_cache else None
+	if key and (cached := _cache_get(key)) is not None:
+		return cached
+	url = _url_for(model, api_key)
+	resp = _SESSION.post(
+		url, content=_encode_payload(prompt), headers=_JSON_HEADERS, timeout=timeout
+	)
+	resp.raise_for_status()
+	obj = orjson.loads(resp.content)
+	text = _candidate_text(obj)
+	if text is None:
+		# Blocked or empty responses are returned as JSON but never cached
+		return orjson.dumps(obj).decode("utf-8")
+	if key and text:
+		_cache_put(key, text)
+	return text
+
+
+async def call_gemini_async(
+	api_key: str,
+	model: str,
+	prompt: str,
+	timeout: float = 20.0,
+	use_cache: bool = True,
+) -> str:
+	"""Async variant of call_gemini for issuing several prompts concurrently."""
+	key = _cache_key(model, prompt) if use_cache else None
+	if key and (cached := _cache_get(key)) is not None:
+		return cached
+	url = _url_for(model, api_key)
+	resp = await _async_session().post(
+		url, content=_encode_payload(prompt), headers=_JSON_HEADERS, timeout=timeout
+	)
+	resp.raise_for_status()
+	obj = orjson.loads(resp.content)
+	text = _candidate_text(obj)
+	if text is None:
+		# Blocked or empty responses are returned as JSON but never cached
+		return orjson.dumps(obj).decode("utf-8")
+	if key and text:
+		_cache_put(key, text)
+	return text
+
+
+def _async_session() -> httpx.AsyncClient:
+	global _ASYNC_SESSION, _ASYNC_LOOP
+	loop = asyncio.get_running_loop()
+	if _ASYNC_SESSION is None or _ASYNC_LOOP is not loop:
+		# A client from a previous loop cannot be awaited here; its
+		# connections are dropped with that loop.
+		_ASYNC_SESSION = httpx.AsyncClient(limits=_LIMITS)
+		_ASYNC_LOOP = loop
+	return _ASYNC_SESSION
+
+
+def close() -> None:
+	"""Closes the shared synchronous client."""
+	_SESSION.close()
+
+
+async def aclose() -> None:
+	"""Closes the async client owned by the running event loop, if any."""
+	global _ASYNC_SESSION, _ASYNC_LOOP
+	if _ASYNC_SESSION is not None and _ASYNC_LOOP is asyncio.get_running_loop():
+		await _ASYNC_SESSION.aclose()
+		_ASYNC_SESSION = None
+		_ASYNC_LOOP = None
 
 
 def main() -> None:
@@ -49,7 +186,12 @@ def main() -> None:
 		sys.exit(1)
 
 	model = os.environ.get("GEMINI_MODEL_ID", DEFAULT_MODEL_ID)
-	text = call_gemini(api_key=api_key, model=model, prompt="ping")
+	try:
+		text = call_gemini(
+			api_key=api_key, model=model, prompt="ping", use_cache=False
+		)
+	finally:
+		close()
 	print(text or "<empty>")
 
 
@@ -1,4 +1,6 @@
+import json
 import logging  # Import the logging module
+import os
 
 from uuid import uuid4
 
@@ -17,14 +19,46 @@ from a2a.types import (
 from a2a.utils import proto_utils
 
 
+# Keep the channel alive between the unary and streaming calls, and let gRPC
+# retry calls that fail while the server is still coming up.
+CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 30000),
+    ('grpc.keepalive_timeout_ms', 10000),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.enable_retries', 1),
+    (
+        'grpc.service_config',
+        json.dumps(
+            {
+                'methodConfig': [
+                    {
+                        'name': [{}],
+                        'retryPolicy': {
+                            'maxAttempts': 4,
+                            'initialBackoff': '0.1s',
+                            'maxBackoff': '2s',
+                            'backoffMultiplier': 2,
+                            'retryableStatusCodes': ['UNAVAILABLE'],
+                        },
+                    }
+                ]
+            }
+        ),
+    ),
+]
+
+
 async def main() -> None:
     # Configure logging to show INFO level messages
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)  # Get a logger instance
 
-    base_url = '[::]:11001'
+    # The agent card is served over gRPC too, so no HTTP lookup is needed.
+    base_url = os.getenv('A2A_GRPC_URL', '[::]:11001')
 
-    async with grpc.aio.insecure_channel(base_url) as channel:
+    async with grpc.aio.insecure_channel(
+        base_url, options=CHANNEL_OPTIONS
+    ) as channel:
         stub = a2a_pb2_grpc.A2AServiceStub(channel)
         # Fetch Public Agent Card and Initialize Client
         final_agent_card_to_use: AgentCard | None = None
@@ -55,12 +89,12 @@ async def main() -> None:
         )
 
         response = await client.send_message(request)
-        print(response.model_dump(mode='json', exclude_none=True))
+        print(response.model_dump_json(exclude_none=True))
 
         stream_response = client.send_message_streaming(request)
 
         async for chunk in stream_response:
-            print(chunk.model_dump(mode='json', exclude_none=True))
+            print(chunk.model_dump_json(exclude_none=True))
 
 
 if __name__ == '__main__':
@@ -19,6 +19,25 @@ from a2a.utils.constants import (
 )
 
 
+def _task_of(response: Any) -> Any:
+    """Returns the task from a ClientFactory (Task, Event|None) response."""
+    if isinstance(response, tuple) and response:
+        return response[0]
+    return response
+
+
+def _print_model(obj: Any, label: str | None = None) -> None:
+    """Prints a pydantic model as JSON, or the object itself otherwise."""
+    try:
+        text = obj.model_dump_json(exclude_none=True)
+    except AttributeError:
+        text = obj  # Fallback to direct print
+    if label:
+        print(label, text)
+    else:
+        print(text)
+
+
 async def main() -> None:
     # Configure logging to show INFO level messages
     logging.basicConfig(level=logging.INFO)
@@ -30,8 +49,16 @@ async def main() -> None:
     base_url = os.getenv('A2A_BASE_URL', 'http://localhost:8080')
 
     # Disable system proxies to ensure localhost traffic doesn't go through an HTTP proxy
-    # and add a reasonable timeout for local development.
-    async with httpx.AsyncClient(trust_env=False, timeout=httpx.Timeout(30.0)) as httpx_client:
+    # and add a reasonable timeout for local development. The same client is
+    # handed to ClientFactory so card fetches and messages share connections.
+    # HTTP/2 is negotiated over TLS only, so a plain http:// base URL stays
+    # on HTTP/1.1.
+    async with httpx.AsyncClient(
+        trust_env=False,
+        timeout=httpx.Timeout(30.0),
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    ) as httpx_client:
         # Initialize A2ACardResolver
         resolver = A2ACardResolver(
             httpx_client=httpx_client,
@@ -105,7 +132,7 @@ async def main() -> None:
 
         # --8<-- [start:send_message]
         # Initialize client using ClientFactory
-        config = ClientConfig()
+        config = ClientConfig(httpx_client=httpx_client)
         factory = ClientFactory(config)
         # Create client with card parameter
         client = factory.create(card=final_agent_card_to_use)
@@ -120,14 +147,7 @@ async def main() -> None:
         )
         async for response_tuple in client.send_message(message):
             # ClientFactory client returns tuples: (Task, Event|None)
-            if isinstance(response_tuple, tuple) and len(response_tuple) > 0:
-                task, event = response_tuple
-                if hasattr(task, 'model_dump'):
-                    print(task.model_dump(mode='json', exclude_none=True))
-                else:
-                    print(task)  # Fallback to direct print
-            else:
-                print(response_tuple)  # Fallback to direct print
+            _print_model(_task_of(response_tuple))
             break  # Get the first (and likely only) response for non-streaming
         # --8<-- [end:send_message]
 
@@ -145,23 +165,17 @@ async def main() -> None:
         )
         async for response_tuple in client.send_message(multiturn_message):
             # ClientFactory client returns tuples: (Task, Event|None)
-            if isinstance(response_tuple, tuple) and len(response_tuple) > 0:
-                task, event = response_tuple
-                if hasattr(task, 'model_dump'):
-                    print(task.model_dump(mode='json', exclude_none=True))
-                    # Extract task_id and context_id from task
-                    if hasattr(task, 'id'):
-                        task_id = task.id
-                    if hasattr(task, 'context_id'):
-                        context_id = task.context_id
+            task = _task_of(response_tuple)
+            _print_model(task)
+            # Extract task_id and context_id from the task (or dict-like task).
+            # A bare Message reply carries no task, so the ids stay unset.
+            if isinstance(response_tuple, tuple):
+                if isinstance(task, dict):
+                    task_id = task.get('id')
+                    context_id = task.get('context_id') or task.get('contextId')
                 else:
-                    print(task)  # Fallback to direct print
-                    # Try to extract IDs from dict-like task
-                    if isinstance(task, dict):
-                        task_id = task.get('id')
-                        context_id = task.get('context_id') or task.get('contextId')
-            else:
-                print(response_tuple)  # Fallback to direct print
+                    task_id = getattr(task, 'id', None)
+                    context_id = getattr(task, 'context_id', None)
             break  # Get the first response
 
         # Use the ClientFactory client API for second multiturn message
@@ -174,14 +188,7 @@ async def main() -> None:
         )
         async for response_tuple in client.send_message(second_multiturn_message):
             # ClientFactory client returns tuples: (Task, Event|None)
-            if isinstance(response_tuple, tuple) and len(response_tuple) > 0:
-                task, event = response_tuple
-                if hasattr(task, 'model_dump'):
-                    print(task.model_dump(mode='json', exclude_none=True))
-                else:
-                    print(task)  # Fallback to direct print
-            else:
-                print(response_tuple)  # Fallback to direct print
+            _print_model(_task_of(response_tuple))
             break  # Get the first response
         # --8<-- [end:Multiturn]
 
@@ -199,16 +206,11 @@ async def main() -> None:
             # ClientFactory client returns tuples: (Task, Event|None) for streaming
             if isinstance(response_tuple, tuple) and len(response_tuple) > 0:
                 task, event = response_tuple
-                if hasattr(task, 'model_dump'):
-                    print("Task:", task.model_dump(mode='json', exclude_none=True))
-                else:
-                    print("Task:", task)
-                if event and hasattr(event, 'model_dump'):
-                    print("Event:", event.model_dump(mode='json', exclude_none=True))
-                elif event:
-                    print("Event:", event)
+                _print_model(task, "Task:")
+                if event:
+                    _print_model(event, "Event:")
             else:
-                print(response_tuple)  # Fallback to direct print
+                _print_model(response_tuple)
         # --8<-- [end:send_message_streaming]
 
 